@@ -0,0 +1,19 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+async def copy_records(
+    engine: AsyncEngine,
+    table_name: str,
+    columns: Sequence[str],
+    records: Sequence[tuple[Any, ...]],
+) -> None:
+    async with engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table_name,
+            records=records,
+            columns=list(columns),
+        )
@@ -1,3 +1,4 @@
+import asyncio
 from asyncio import current_task
 from typing import Any
 
@@ -9,17 +10,35 @@ from sqlalchemy.ext.asyncio import (
     async_scoped_session,
 )
 
+from app.core.metrics import metrics_registry
+from .pool import (
+    InstrumentedQueuePool,
+    PoolMonitor,
+    prewarm_pool,
+)
 from .settings import database_settings
 
 
-def get_async_engine(**kwargs: Any) -> AsyncEngine:
-    return create_async_engine(
-        url=database_settings.url,
+def get_async_engine(url: str | None = None, **kwargs: Any) -> AsyncEngine:
+    engine = create_async_engine(
+        url=url or database_settings.url,
         echo=database_settings.echo,
         echo_pool=database_settings.echo_pool,
         pool_pre_ping=database_settings.pool_pre_ping,
+        poolclass=InstrumentedQueuePool,
+        pool_size=database_settings.pool_size,
+        max_overflow=database_settings.pool_max_overflow,
+        pool_timeout=database_settings.pool_timeout,
+        pool_recycle=database_settings.pool_recycle,
+        pool_use_lifo=database_settings.pool_use_lifo,
+        connect_args={
+            "prepared_statement_cache_size": database_settings.statement_cache_size,
+            **database_settings.connect_args,
+        },
         **kwargs,
     )
+    PoolMonitor(engine, 0.0 if database_settings.pool_pre_ping else database_settings.pool_ping_idle)
+    return engine
 
 
 def get_async_session_factory(
@@ -38,6 +57,42 @@ def get_async_session_factory(
 async_engine: AsyncEngine = get_async_engine()
 async_session_factory: async_sessionmaker[AsyncSession] = get_async_session_factory(async_engine)
 
+shard_engines: list[AsyncEngine] = [
+    async_engine,
+    *(get_async_engine(url) for url in database_settings.shard_urls),
+]
+shard_session_factories: list[async_sessionmaker[AsyncSession]] = [
+    async_session_factory,
+    *(get_async_session_factory(engine) for engine in shard_engines[1:]),
+]
+
+shard_replica_engines: list[list[AsyncEngine]] = [
+    [get_async_engine(url) for url in urls]
+    for urls in [database_settings.replica_urls, *database_settings.shard_replica_urls][:len(shard_engines)]
+]
+shard_replica_engines.extend([] for _ in range(len(shard_replica_engines), len(shard_engines)))
+shard_replica_session_factories: list[list[async_sessionmaker[AsyncSession]]] = [
+    [get_async_session_factory(engine) for engine in engines] for engines in shard_replica_engines
+]
+
+for shard, engine in enumerate(shard_engines):
+    namespace = "database_pool" if shard == 0 else f"database_pool_shard{shard}"
+    metrics_registry.register(namespace, engine.pool.monitor.stats)
+    for replica, replica_engine in enumerate(shard_replica_engines[shard]):
+        metrics_registry.register(f"{namespace}_replica{replica}", replica_engine.pool.monitor.stats)
+
+
+def all_engines() -> list[AsyncEngine]:
+    return [*shard_engines, *(engine for engines in shard_replica_engines for engine in engines)]
+
+
+async def prewarm_engines(size: int) -> int:
+    return sum(await asyncio.gather(*(prewarm_pool(engine, size) for engine in all_engines())))
+
+
+async def dispose_engines() -> None:
+    await asyncio.gather(*(engine.dispose() for engine in all_engines()))
+
 
 def get_async_scoped_session():
     return async_scoped_session(
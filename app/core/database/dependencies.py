@@ -1,7 +1,10 @@
+from collections.abc import AsyncIterator
+
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .connection import get_async_scoped_session
+from .sharding import ShardSessions
 
 
 async def scoped_session_dependency() -> AsyncSession:
@@ -13,3 +16,8 @@ async def scoped_session_dependency() -> AsyncSession:
         raise e
     finally:
         await session.close()
+
+
+async def shard_sessions_dependency() -> AsyncIterator[ShardSessions]:
+    async with ShardSessions() as sessions:
+        yield sessions
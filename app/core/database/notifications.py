@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from typing import Any
+
+from sqlalchemy import (
+    Text,
+    bindparam,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+async def publish_notification(session: AsyncSession, channel: str, payload: str) -> None:
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+async def publish_notifications(session: AsyncSession, channel: str, payloads: list[str]) -> None:
+    payload = func.unnest(bindparam("payloads", type_=ARRAY(Text))).column_valued("payload")
+    await session.execute(select(func.pg_notify(channel, payload)), {"payloads": payloads})
+
+
+class PostgresListener:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        channel: str,
+        on_notification: Callable[[str], None],
+        on_resync: Callable[[], Awaitable[None]] | None = None,
+        *,
+        ping_interval: float = 30.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.engine = engine
+        self.channel = channel
+        self.on_notification = on_notification
+        self.on_resync = on_resync
+        self.ping_interval = ping_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connected = False
+        self.notifications = 0
+        self.reconnects = 0
+        self._task: asyncio.Task | None = None
+
+    def _handle_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.notifications += 1
+        try:
+            self.on_notification(payload)
+        except Exception:
+            logger.exception("Failed to handle notification on channel %r", channel)
+
+    async def _listen(self, is_reconnect: bool) -> None:
+        async with self.engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            lost = asyncio.Event()
+            driver_connection.add_termination_listener(lambda _: lost.set())
+            await driver_connection.add_listener(self.channel, self._handle_notification)
+            self.connected = True
+            try:
+                if is_reconnect and self.on_resync is not None:
+                    await self.on_resync()
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=self.ping_interval)
+                    except TimeoutError:
+                        await asyncio.wait_for(driver_connection.execute("SELECT 1"), timeout=self.ping_interval)
+            finally:
+                self.connected = False
+                await connection.invalidate()
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        is_reconnect = False
+        while True:
+            try:
+                await self._listen(is_reconnect)
+                delay = self.reconnect_delay
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Lost LISTEN connection on channel %r, reconnecting in %.1fs", self.channel, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            is_reconnect = True
+            self.reconnects += 1
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "notifications": self.notifications,
+            "reconnects": self.reconnects,
+        }
@@ -0,0 +1,39 @@
+from datetime import (
+    date,
+    timedelta,
+)
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+def daily_partition_name(table_name: str, day: date) -> str:
+    return f"{table_name}_{day:%Y%m%d}"
+
+
+async def ensure_daily_partitions(connection: AsyncConnection, table_name: str, start: date, end: date) -> None:
+    day = start
+    while day <= end:
+        await connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {daily_partition_name(table_name, day)} PARTITION OF {table_name} "
+                f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+            )
+        )
+        day += timedelta(days=1)
+
+
+async def drop_daily_partitions_before(connection: AsyncConnection, table_name: str, before: date) -> list[str]:
+    partitions = await connection.scalars(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table_name"
+        ),
+        {"table_name": table_name},
+    )
+    dropped = [name for name in partitions if name < daily_partition_name(table_name, before)]
+    for name in dropped:
+        await connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    return dropped
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Any
+
+from sqlalchemy import (
+    event,
+    exc,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram
+
+
+CHECKOUT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMonitor:
+    def __init__(self, engine: AsyncEngine, ping_idle: float = 0.0):
+        self.engine = engine
+        self.ping_idle = ping_idle
+        self.checkout_seconds = Histogram(CHECKOUT_BUCKETS)
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pings = 0
+        self.failed_pings = 0
+        engine.pool.monitor = self
+        event.listen(engine.sync_engine, "connect", self._on_connect)
+        event.listen(engine.sync_engine, "checkin", self._on_checkin)
+        event.listen(engine.sync_engine, "invalidate", self._on_invalidate)
+        if ping_idle:
+            event.listen(engine.sync_engine, "checkout", self._on_checkout)
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.connects += 1
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    def _on_invalidate(self, dbapi_connection: Any, connection_record: Any, exception: BaseException | None) -> None:
+        self.invalidations += 1
+
+    def _on_checkout(self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        if time.monotonic() - connection_record.info.get("checked_in_at", 0.0) < self.ping_idle:
+            return
+        self.pings += 1
+        try:
+            self.engine.dialect.do_ping(dbapi_connection)
+        except Exception as ex:
+            self.failed_pings += 1
+            raise exc.DisconnectionError() from ex
+
+    def stats(self) -> dict[str, Any]:
+        pool = self.engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "waits": self.waits,
+            "wait_seconds_total": self.wait_seconds,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "pings": self.pings,
+            "failed_pings": self.failed_pings,
+            "checkout_seconds": self.checkout_seconds,
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    monitor: PoolMonitor | None = None
+
+    def _do_get(self) -> Any:
+        if self.monitor is None:
+            return super()._do_get()
+        waiting = -1 < self._max_overflow <= self.overflow() and self.checkedin() == 0
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.monitor.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.monitor.checkout_seconds.observe(elapsed)
+            if waiting:
+                self.monitor.waits += 1
+                self.monitor.wait_seconds += elapsed
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+
+async def prewarm_pool(engine: AsyncEngine, size: int) -> int:
+    connections = [engine.connect() for _ in range(min(size, engine.pool.size()))]
+    results = await asyncio.gather(*(connection.start() for connection in connections), return_exceptions=True)
+    await asyncio.gather(*(connection.close() for connection in connections if connection.sync_connection is not None))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(connections)
@@ -0,0 +1,159 @@
+import itertools
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import (
+    event,
+    text,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+)
+from sqlalchemy.orm import (
+    ORMExecuteState,
+    Session,
+)
+
+from app.core.metrics import metrics_registry
+from app.core.tasks import PeriodicTask
+from .connection import shard_replica_session_factories
+from .settings import database_settings
+
+
+logger = logging.getLogger(__name__)
+
+REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush_writes(session: Session, flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+def has_written(session: AsyncSession) -> bool:
+    return session.info.get("wrote", False)
+
+
+class ReplicaPool:
+    def __init__(
+        self,
+        session_factories: list[async_sessionmaker[AsyncSession]],
+        max_lag: float = 0.0,
+        eject_seconds: float = 30.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.session_factories = session_factories
+        self.max_lag = max_lag
+        self.eject_seconds = eject_seconds
+        self.lags: list[float | None] = [None] * len(session_factories)
+        self.sessions = 0
+        self.ejections = 0
+        self.failed_checks = 0
+        self._timer = timer
+        self._ejected_until = [0.0] * len(session_factories)
+        self._cursor = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.session_factories)
+
+    def is_available(self, index: int) -> bool:
+        return self._ejected_until[index] <= self._timer()
+
+    def choose(self) -> int | None:
+        for _ in range(len(self.session_factories)):
+            index = next(self._cursor) % len(self.session_factories)
+            if self.is_available(index):
+                return index
+        return None
+
+    def is_fresh(self, index: int) -> bool:
+        lag = self.lags[index]
+        return lag is not None and lag <= self.max_lag
+
+    def eject(self, index: int) -> None:
+        self._ejected_until[index] = self._timer() + self.eject_seconds
+        self.ejections += 1
+
+    def session(self) -> AsyncSession | None:
+        if (index := self.choose()) is None:
+            return None
+        session = self.session_factories[index]()
+        session.info["replica"] = (self, index)
+        self.sessions += 1
+        return session
+
+    async def check(self) -> None:
+        for index, session_factory in enumerate(self.session_factories):
+            try:
+                async with session_factory() as session:
+                    lag = float(await session.scalar(REPLICA_LAG_SQL))
+            except (DBAPIError, OSError):
+                logger.warning("Replica %d failed its health check", index, exc_info=True)
+                self.lags[index] = None
+                self.failed_checks += 1
+                self.eject(index)
+                continue
+            self.lags[index] = lag
+            if self.max_lag and lag > self.max_lag:
+                self.eject(index)
+            else:
+                self._ejected_until[index] = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        stats = {
+            "replicas": len(self.session_factories),
+            "available": sum(map(self.is_available, range(len(self.session_factories)))),
+            "sessions": self.sessions,
+            "ejections": self.ejections,
+            "failed_checks": self.failed_checks,
+        }
+        for index, lag in enumerate(self.lags):
+            if lag is not None:
+                stats[f"replica{index}_lag_seconds"] = lag
+        return stats
+
+
+def eject_replica(session: AsyncSession) -> None:
+    pool, index = session.info["replica"]
+    pool.eject(index)
+
+
+def is_fresh_replica(session: AsyncSession) -> bool:
+    pool, index = session.info["replica"]
+    return pool.is_fresh(index)
+
+
+shard_replica_pools: list[ReplicaPool] = [
+    ReplicaPool(factories, database_settings.replica_max_lag, database_settings.replica_eject_seconds)
+    for factories in shard_replica_session_factories
+]
+
+
+async def check_replicas() -> None:
+    for pool in shard_replica_pools:
+        await pool.check()
+
+
+replica_health_checker = PeriodicTask(
+    func=check_replicas,
+    interval=database_settings.replica_check_interval,
+)
+
+for shard, replica_pool in enumerate(shard_replica_pools):
+    if replica_pool:
+        metrics_registry.register("database_replicas" if shard == 0 else f"database_replicas_shard{shard}", replica_pool.stats)
+metrics_registry.register("database_replicas_health", replica_health_checker.stats)
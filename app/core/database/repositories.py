@@ -1,11 +1,34 @@
+import json
+import logging
 from abc import ABC
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Select,
+    select,
+    text,
+)
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from .models import BaseDAO
+from .notifications import (
+    publish_notification,
+    publish_notifications,
+)
+from .replicas import (
+    eject_replica,
+    has_written,
+    is_fresh_replica,
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 class BaseAlchemyRepository[M: BaseDAO, S: BaseModel](ABC):
@@ -13,8 +36,29 @@ class BaseAlchemyRepository[M: BaseDAO, S: BaseModel](ABC):
     model_type: type[M]
     schema_type: type[S]
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, replica: AsyncSession | None = None):
         self.session = session
+        self.replica = replica
+
+    async def _read(
+        self,
+        query: Callable[[AsyncSession], Awaitable[Any]],
+        *,
+        fallback: bool = True,
+        primary: bool = False,
+    ) -> Any:
+        if self.replica is not None and not primary and not has_written(self.session):
+            try:
+                result = await query(self.replica)
+            except (DBAPIError, OSError):
+                logger.warning("Replica read failed, falling back to the primary", exc_info=True)
+                eject_replica(self.replica)
+                await self.replica.rollback()
+                self.replica = None
+            else:
+                if result is not None or not fallback or is_fresh_replica(self.replica):
+                    return result
+        return await query(self.session)
 
     async def create(self, **data: Any) -> S:
         instance = self.model_type(**data)
@@ -23,16 +67,23 @@ class BaseAlchemyRepository[M: BaseDAO, S: BaseModel](ABC):
         return self.schema_type.model_validate(instance)
 
     async def get(self, id_: int) -> S | None:
-        instance = await self.session.get(self.model_type, id_)
+        instance = await self._read(lambda session: session.get(self.model_type, id_))
         if instance is None:
             return None
         return self.schema_type.model_validate(instance)
 
     async def get_all(self, **data: Any) -> list[S]:
         stmt = select(self.model_type).filter_by(**data)
-        instances = await self.session.scalars(stmt)
+        instances = await self._read(lambda session: session.scalars(stmt), fallback=False)
         return list(map(self.schema_type.model_validate, instances))
 
+    async def estimate_rows(self, stmt: Select) -> int:
+        sql = stmt.compile(dialect=self.session.bind.dialect, compile_kwargs={"literal_binds": True})
+        plan = await self._read(lambda session: session.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}")), fallback=False)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def update(self, id_: int, **data: Any) -> S | None:
         instance = await self.session.get(self.model_type, id_)
         if instance is None:
@@ -48,3 +99,13 @@ class BaseAlchemyRepository[M: BaseDAO, S: BaseModel](ABC):
         await self.session.delete(instance)
         await self.session.commit()
         return self.schema_type.model_validate(instance)
+
+    async def publish(self, channel: str, payload: str, *, commit: bool = False) -> None:
+        await publish_notification(self.session, channel, payload)
+        if commit:
+            await self.session.commit()
+
+    async def publish_many(self, channel: str, payloads: list[str], *, commit: bool = False) -> None:
+        await publish_notifications(self.session, channel, payloads)
+        if commit:
+            await self.session.commit()
@@ -0,0 +1,72 @@
+import asyncio
+from collections import deque
+from typing import Any
+
+from sqlalchemy import (
+    func,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+SEQUENCE_CONFIG_LOCK = 0x73657173
+
+
+class SequenceBlockAllocator:
+    def __init__(self, sequence_name: str, block_size: int):
+        if block_size <= 0:
+            raise ValueError("Block size must be positive.")
+        self.sequence_name = sequence_name
+        self.block_size = block_size
+        self.blocks_allocated = 0
+        self.ids_issued = 0
+        self._ids: deque[int] = deque()
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    async def _allocate_block(self, session: AsyncSession, size: int) -> None:
+        stmt = select(func.nextval(self.sequence_name)).select_from(func.generate_series(1, size))
+        self._ids.extend(await session.scalars(stmt))
+        self.blocks_allocated += 1
+
+    async def next_ids(self, session: AsyncSession, count: int) -> list[int]:
+        while len(self._ids) < count:
+            async with self._lock:
+                if (missing := count - len(self._ids)) > 0:
+                    await self._allocate_block(session, max(self.block_size, missing))
+        self.ids_issued += count
+        return [self._ids.popleft() for _ in range(count)]
+
+    async def next_id(self, session: AsyncSession) -> int:
+        return (await self.next_ids(session, 1))[0]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "block_size": self.block_size,
+            "blocks_allocated": self.blocks_allocated,
+            "ids_issued": self.ids_issued,
+            "ids_remaining": len(self._ids),
+        }
+
+
+async def configure_interleaved_sequence(
+    session: AsyncSession,
+    sequence_name: str,
+    offset: int,
+    stride: int,
+) -> None:
+    await session.execute(select(func.pg_advisory_xact_lock(SEQUENCE_CONFIG_LOCK, func.hashtext(sequence_name))))
+    increment_by, last_value = (
+        await session.execute(
+            text("SELECT increment_by, last_value FROM pg_sequences WHERE sequencename = :name"),
+            {"name": sequence_name},
+        )
+    ).one()
+    if increment_by != stride or (last_value is not None and last_value % stride != offset):
+        start = (last_value or 0) + 1
+        await session.execute(text(f"ALTER SEQUENCE {sequence_name} INCREMENT BY {stride}"))
+        await session.execute(select(func.setval(sequence_name, start + (offset - start) % stride, False)))
+    await session.commit()
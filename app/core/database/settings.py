@@ -1,4 +1,7 @@
-from typing import Annotated
+from typing import (
+    Annotated,
+    Any,
+)
 
 from pydantic import Field
 from pydantic_settings import (
@@ -21,10 +24,25 @@ class DatabaseSettings(BaseSettings):
     name: Annotated[str, Field(alias="DATABASE_NAME")]
     echo: Annotated[bool, Field(alias="DATABASE_ECHO")] = False
     echo_pool: Annotated[bool, Field(alias="DATABASE_ECHO_POOL")] = False
-    pool_pre_ping: Annotated[bool, Field(alias="DATABASE_POOL_PRE_PING")] = True
+    pool_pre_ping: Annotated[bool, Field(alias="DATABASE_POOL_PRE_PING")] = False
+    pool_ping_idle: Annotated[float, Field(alias="DATABASE_POOL_PING_IDLE", ge=0)] = 30.0
+    pool_size: Annotated[int, Field(alias="DATABASE_POOL_SIZE", ge=0)] = 5
+    pool_max_overflow: Annotated[int, Field(alias="DATABASE_POOL_MAX_OVERFLOW", ge=-1)] = 10
+    pool_timeout: Annotated[float, Field(alias="DATABASE_POOL_TIMEOUT", gt=0)] = 30.0
+    pool_recycle: Annotated[int, Field(alias="DATABASE_POOL_RECYCLE", ge=-1)] = 1800
+    pool_prewarm: Annotated[int, Field(alias="DATABASE_POOL_PREWARM", ge=0)] = 5
+    pool_use_lifo: Annotated[bool, Field(alias="DATABASE_POOL_USE_LIFO")] = False
+    statement_cache_size: Annotated[int, Field(alias="DATABASE_STATEMENT_CACHE_SIZE", ge=0)] = 100
+    connect_args: Annotated[dict[str, Any], Field(alias="DATABASE_CONNECT_ARGS")] = {}
     auto_flush: Annotated[bool, Field(alias="DATABASE_AUTO_FLUSH")] = False
     auto_commit: Annotated[bool, Field(alias="DATABASE_AUTO_COMMIT")] = False
     expire_on_commit: Annotated[bool, Field(alias="DATABASE_EXPIRE_ON_COMMIT")] = False
+    shard_urls: Annotated[list[str], Field(alias="DATABASE_SHARD_URLS")] = []
+    replica_urls: Annotated[list[str], Field(alias="DATABASE_REPLICA_URLS")] = []
+    shard_replica_urls: Annotated[list[list[str]], Field(alias="DATABASE_SHARD_REPLICA_URLS")] = []
+    replica_max_lag: Annotated[float, Field(alias="DATABASE_REPLICA_MAX_LAG", ge=0)] = 1.0
+    replica_check_interval: Annotated[float, Field(alias="DATABASE_REPLICA_CHECK_INTERVAL", gt=0)] = 5.0
+    replica_eject_seconds: Annotated[float, Field(alias="DATABASE_REPLICA_EJECT_SECONDS", gt=0)] = 30.0
 
     @property
     def url(self) -> str:
@@ -0,0 +1,71 @@
+import asyncio
+from types import TracebackType
+from typing import Self
+
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_scoped_session,
+    async_sessionmaker,
+)
+
+from .connection import shard_session_factories as default_session_factories
+from .replicas import (
+    ReplicaPool,
+    shard_replica_pools,
+)
+
+
+class ShardSessions:
+    def __init__(
+        self,
+        session_factories: list[async_sessionmaker[AsyncSession]] | None = None,
+        primary: AsyncSession | async_scoped_session[AsyncSession] | None = None,
+        replica_pools: list[ReplicaPool] | None = None,
+    ):
+        self.session_factories = default_session_factories if session_factories is None else session_factories
+        self.replica_pools = shard_replica_pools if replica_pools is None else replica_pools
+        self._sessions: dict[int, AsyncSession] = {}
+        self._replicas: dict[int, AsyncSession | None] = {}
+        self._owned: list[AsyncSession] = []
+        if isinstance(primary, async_scoped_session):
+            primary = primary()
+        if primary is not None:
+            self._sessions[0] = primary
+
+    def __len__(self) -> int:
+        return len(self.session_factories)
+
+    def __getitem__(self, shard: int) -> AsyncSession:
+        if shard not in self._sessions:
+            session = self.session_factories[shard]()
+            self._sessions[shard] = session
+            self._owned.append(session)
+        return self._sessions[shard]
+
+    def replica(self, shard: int) -> AsyncSession | None:
+        if shard not in self._replicas:
+            session = self.replica_pools[shard].session() if shard < len(self.replica_pools) else None
+            self._replicas[shard] = session
+            if session is not None:
+                self._owned.append(session)
+        return self._replicas[shard]
+
+    async def rollback(self) -> None:
+        await asyncio.gather(*(session.rollback() for session in self._sessions.values()))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(session.close() for session in self._owned))
+        self._owned.clear()
+        self._sessions.clear()
+        self._replicas.clear()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
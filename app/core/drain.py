@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import signal
+import threading
+from collections.abc import Callable
+from types import FrameType
+from typing import Any
+
+from starlette.types import (
+    ASGIApp,
+    Receive,
+    Scope,
+    Send,
+)
+
+from .exceptions import ServiceDraining
+from .metrics import metrics_registry
+from .settings import app_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDrain:
+    def __init__(self, retry_after: int = 1):
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def accept(self) -> None:
+        self.draining = False
+
+    def begin(self) -> None:
+        self.draining = True
+
+    def enter(self) -> bool:
+        if self.draining:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        self._idle.clear()
+        return True
+
+    def exit(self) -> None:
+        self.in_flight -= 1
+        if not self.in_flight:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        self.begin()
+        if self._idle.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except TimeoutError:
+            logger.warning("Shutting down with %d requests still in flight", self.in_flight)
+            return False
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "draining": self.draining,
+        }
+
+
+class DrainMiddleware:
+    def __init__(self, app: ASGIApp, drain: RequestDrain):
+        self.app = app
+        self.drain = drain
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if not self.drain.enter():
+            return await self._reject(send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.drain.exit()
+
+    async def _reject(self, send: Send) -> None:
+        ex = ServiceDraining()
+        body = ex.body
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(self.drain.retry_after).encode()),
+            (b"connection", b"close"),
+        ]
+        await send({"type": "http.response.start", "status": ex.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def drain_on_signal(drain: RequestDrain, signum: int = signal.SIGTERM) -> Callable[[], None]:
+    if threading.current_thread() is not threading.main_thread():
+        return lambda: None
+    previous = signal.getsignal(signum)
+
+    def handler(received: int, frame: FrameType | None) -> None:
+        drain.begin()
+        if callable(previous):
+            previous(received, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signum, signal.SIG_DFL)
+            signal.raise_signal(signum)
+
+    signal.signal(signum, handler)
+    return lambda: signal.signal(signum, previous)
+
+
+request_drain = RequestDrain(retry_after=app_settings.drain_retry_after)
+
+metrics_registry.register("http_drain", request_drain.stats)
@@ -1,12 +1,11 @@
 from typing import TYPE_CHECKING
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
 from .exceptions import (
     ApplicationError,
     UnexpectedErrorResponse,
 )
-from .schemas import ErrorResponse
 
 
 if TYPE_CHECKING:
@@ -19,21 +18,19 @@ if TYPE_CHECKING:
 async def application_exception_handler(
     request: "Request",
     ex: ApplicationError,
-) -> JSONResponse:
-    return JSONResponse(
+) -> Response:
+    return Response(
         status_code=ex.status_code,
-        content=ErrorResponse(
-            msg=ex.message,
-            code=ex.error_code,
-        ).model_dump(mode="json"),
+        content=ex.body,
         headers=ex.headers,
+        media_type="application/json",
     )
 
 
 async def unhandled_exception_handler(
     request: "Request",
     ex: Exception,
-) -> JSONResponse:
+) -> Response:
     return UnexpectedErrorResponse()
 
 
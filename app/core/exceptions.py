@@ -1,15 +1,26 @@
+from functools import lru_cache
+
 from fastapi import status
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
 from .schemas import ErrorResponse
 
 
+@lru_cache(maxsize=1024)
+def render_error(message: str, error_code: str) -> bytes:
+    return ErrorResponse(msg=message, code=error_code).model_dump_json().encode()
+
+
 class ApplicationError(Exception):
     message: str = "Internal server error"
     error_code: str = "unknown_error"
     status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR
     headers: dict[str, str] | None = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        render_error(cls.message, cls.error_code)
+
     def __init__(
         self,
         *,
@@ -29,17 +40,26 @@ class ApplicationError(Exception):
             self.headers,
         )
 
+    @property
+    def body(self) -> bytes:
+        return render_error(self.message, self.error_code)
+
     def __repr__(self) -> str:
         class_name = self.__class__.__name__
         return f'{class_name}(message="{self.message}", error_code={self.error_code}, status_code={self.status_code})'
 
 
-class UnexpectedErrorResponse(JSONResponse):
+class UnexpectedErrorResponse(Response):
+    media_type = "application/json"
+
     def __init__(self):
         super().__init__(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(
-                msg="Internal Server Error",
-                code="unexpected_error",
-            ).model_dump(mode="json"),
+            content=render_error("Internal Server Error", "unexpected_error"),
         )
+
+
+class ServiceDraining(ApplicationError):
+    message = "Service is shutting down"
+    error_code = "service_draining"
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
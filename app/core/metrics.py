@@ -0,0 +1,60 @@
+import bisect
+import math
+from collections.abc import (
+    Callable,
+    Iterable,
+)
+from typing import Any
+
+
+Collector = Callable[[], dict[str, Any]]
+
+
+class Histogram:
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip([*self.buckets, math.inf], self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{"+Inf" if bound == math.inf else float(bound)}"}} {float(cumulative)}')
+        lines.append(f"{name}_sum {self.sum}")
+        lines.append(f"{name}_count {float(self.count)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._collectors: dict[str, Collector] = {}
+
+    def register(self, namespace: str, collector: Collector) -> None:
+        self._collectors[namespace] = collector
+
+    def unregister(self, namespace: str) -> None:
+        self._collectors.pop(namespace, None)
+
+    def collect(self) -> dict[str, dict[str, Any]]:
+        return {namespace: collector() for namespace, collector in self._collectors.items()}
+
+    def render(self) -> str:
+        lines = []
+        for namespace, values in self.collect().items():
+            for key, value in values.items():
+                if isinstance(value, (bool, int, float)):
+                    lines.append(f"{namespace}_{key} {float(value)}")
+                elif isinstance(value, Histogram):
+                    lines.extend(value.render(f"{namespace}_{key}"))
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
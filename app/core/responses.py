@@ -0,0 +1,29 @@
+from collections.abc import Mapping
+from typing import Any
+
+from fastapi.responses import (
+    JSONResponse,
+    Response,
+)
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+
+
+class PydanticJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class TypedJSONResponse(Response):
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        adapter: TypeAdapter[Any],
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ):
+        super().__init__(adapter.dump_json(content), status_code, headers, background=background)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from .metrics import metrics_registry
+
+
+router = APIRouter(
+    tags=["Metrics"],
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> str:
+    return metrics_registry.render()
@@ -0,0 +1,19 @@
+from typing import Annotated
+
+from pydantic import Field
+from pydantic_settings import (
+    BaseSettings,
+    SettingsConfigDict,
+)
+
+
+class AppSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        extra="ignore",
+    )
+
+    drain_timeout: Annotated[float, Field(alias="APP_DRAIN_TIMEOUT", ge=0)] = 25.0
+    drain_retry_after: Annotated[int, Field(alias="APP_DRAIN_RETRY_AFTER", ge=0)] = 1
+
+
+app_settings = AppSettings()
@@ -0,0 +1,251 @@
+import hashlib
+import heapq
+import math
+import time
+from collections import deque
+from collections.abc import (
+    Callable,
+    Iterable,
+)
+from typing import Any
+
+
+def hash_pair(item: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8]), int.from_bytes(digest[8:]) | 1
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity <= 0:
+            raise ValueError("Bloom filter capacity must be positive.")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, item: str) -> list[int]:
+        h1, h2 = hash_pair(item)
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def estimated_error_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "items": self.count,
+            "size_bits": self.size,
+            "size_bytes": len(self._bits),
+            "hash_count": self.hash_count,
+            "target_error_rate": self.error_rate,
+            "estimated_error_rate": self.estimated_error_rate,
+        }
+
+
+class SpaceSaving:
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Space-Saving capacity must be positive.")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._counts
+
+    def _push(self, item: str, count: int) -> None:
+        heapq.heappush(self._heap, (count, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, item) for item, count in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> tuple[int, str]:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                return count, item
+
+    def add(self, item: str, count: int = 1, error: int = 0) -> None:
+        self.total += count
+        if item in self._counts:
+            self._counts[item] += count
+            self._errors[item] += error
+        elif len(self._counts) < self.capacity:
+            self._counts[item] = count
+            self._errors[item] = error
+        else:
+            min_count, min_item = self._pop_min()
+            del self._counts[min_item], self._errors[min_item]
+            self._counts[item] = min_count + count
+            self._errors[item] = min_count + error
+        self._push(item, self._counts[item])
+
+    @property
+    def min_count(self) -> int:
+        if len(self._counts) < self.capacity:
+            return 0
+        return min(self._counts.values())
+
+    def items(self) -> list[tuple[str, int, int]]:
+        return [(item, count, self._errors[item]) for item, count in self._counts.items()]
+
+    def top(self, n: int) -> list[tuple[str, int, int]]:
+        return heapq.nlargest(n, self.items(), key=lambda entry: entry[1])
+
+    @classmethod
+    def merged(cls, capacity: int, summaries: Iterable[tuple[Iterable[tuple[str, int, int]], int]]) -> "SpaceSaving":
+        summaries = [(list(entries), min_count) for entries, min_count in summaries]
+        counts: dict[str, list[int]] = {item: [0, 0] for entries, _ in summaries for item, _, _ in entries}
+        for entries, min_count in summaries:
+            seen = set()
+            for item, count, error in entries:
+                counts[item][0] += count
+                counts[item][1] += error
+                seen.add(item)
+            for item in counts.keys() - seen:
+                counts[item][0] += min_count
+                counts[item][1] += min_count
+        result = cls(capacity)
+        for item, (count, error) in heapq.nlargest(capacity, counts.items(), key=lambda entry: entry[1][0]):
+            result.add(item, count, error)
+        result.total = sum(count for entries, _ in summaries for _, count, _ in entries)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "items": len(self._counts),
+            "total": self.total,
+        }
+
+
+class SlidingTopK:
+    def __init__(
+        self,
+        window: float,
+        buckets: int,
+        capacity: int,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        if window <= 0 or buckets <= 0:
+            raise ValueError("Sliding window and bucket count must be positive.")
+        self.window = window
+        self.bucket_count = buckets
+        self.bucket_width = window / buckets
+        self.capacity = capacity
+        self._timer = timer
+        self._buckets: deque[tuple[int, SpaceSaving]] = deque()
+
+    def _expire(self, index: int) -> None:
+        while self._buckets and self._buckets[0][0] <= index - self.bucket_count:
+            self._buckets.popleft()
+
+    def add(self, item: str, count: int = 1) -> None:
+        index = int(self._timer() // self.bucket_width)
+        if not self._buckets or self._buckets[-1][0] != index:
+            self._expire(index)
+            self._buckets.append((index, SpaceSaving(self.capacity)))
+        self._buckets[-1][1].add(item, count)
+
+    def summary(self) -> SpaceSaving:
+        self._expire(int(self._timer() // self.bucket_width))
+        return SpaceSaving.merged(
+            self.capacity,
+            ((sketch.items(), sketch.min_count) for _, sketch in self._buckets),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "buckets": len(self._buckets),
+            "items": sum(len(sketch) for _, sketch in self._buckets),
+        }
+
+
+class HyperLogLog:
+    def __init__(self, precision: int, registers: bytes | None = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16.")
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is None:
+            self._registers = bytearray(self.size)
+        elif len(registers) == self.size:
+            self._registers = bytearray(registers)
+        else:
+            raise ValueError("HyperLogLog registers do not match the precision.")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        precision = len(data).bit_length() - 1
+        if len(data) != 1 << precision:
+            raise ValueError("HyperLogLog registers must have a power of two length.")
+        return cls(precision, data)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._registers)
+
+    def add(self, item: str) -> None:
+        value = int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest())
+        index = value >> (64 - self.precision)
+        rank = 64 - self.precision - (value & ((1 << (64 - self.precision)) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def fold(self, precision: int) -> "HyperLogLog":
+        if precision > self.precision:
+            raise ValueError("HyperLogLog can only be folded to a lower precision.")
+        shift = self.precision - precision
+        result = HyperLogLog(precision)
+        for index, rank in enumerate(self._registers):
+            if rank:
+                bits = index & ((1 << shift) - 1)
+                rank = shift - bits.bit_length() + 1 if bits else shift + rank
+                if rank > result._registers[index >> shift]:
+                    result._registers[index >> shift] = rank
+        return result
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision < self.precision:
+            return other.merge(self)
+        if other.precision > self.precision:
+            other = other.fold(self.precision)
+        return HyperLogLog(self.precision, bytes(map(max, self._registers, other._registers)))
+
+    def __len__(self) -> int:
+        return round(self.estimate())
+
+    def estimate(self) -> float:
+        if self.size >= 128:
+            alpha = 0.7213 / (1 + 1.079 / self.size)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[self.size]
+        estimate = alpha * self.size ** 2 / sum(2.0 ** -rank for rank in self._registers)
+        if estimate <= 2.5 * self.size and (zeros := self._registers.count(0)):
+            return self.size * math.log(self.size / zeros)
+        return estimate
+
+    @property
+    def standard_error(self) -> float:
+        return 1.04 / math.sqrt(self.size)
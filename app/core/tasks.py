@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    def __init__(self, func: Callable[[], Awaitable[Any]], interval: float):
+        self.func = func
+        self.interval = interval
+        self.runs = 0
+        self.failures = 0
+        self.last_duration = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> None:
+        started = time.monotonic()
+        try:
+            await self.func()
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.last_duration = time.monotonic() - started
+        self.runs += 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Periodic task %s failed", getattr(self.func, "__name__", self.func))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_duration_seconds": self.last_duration,
+        }
+
+
+class PartialFlushError(Exception):
+    def __init__(self, failed: dict[Any, Any], errors: list[BaseException]):
+        super().__init__(f"{len(errors)} flush group(s) failed, {len(failed)} entries not flushed")
+        self.failed = failed
+        self.errors = errors
+
+
+class FlushBuffer(ABC):
+    def __init__(
+        self,
+        flush: Callable[[dict[Any, Any]], Awaitable[None]],
+        flush_interval: float,
+        flush_threshold: int,
+    ):
+        self._flush = flush
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.flushes = 0
+        self.failed_flushes = 0
+        self._pending: dict[Any, Any] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _check_threshold(self) -> None:
+        if len(self._pending) >= self.flush_threshold:
+            self._wakeup.set()
+
+    @abstractmethod
+    def _restore(self, pending: dict[Any, Any]) -> None:
+        ...
+
+    def _flushed(self, pending: dict[Any, Any]) -> None:
+        pass
+
+    def drain(self) -> dict[Any, Any]:
+        pending, self._pending = self._pending, {}
+        return pending
+
+    async def flush(self) -> None:
+        pending = self.drain()
+        if not pending:
+            return
+        try:
+            await self._flush(pending)
+        except PartialFlushError as e:
+            self.failed_flushes += 1
+            self._restore(e.failed)
+            self._flushed({key: value for key, value in pending.items() if key not in e.failed})
+            raise
+        except BaseException:
+            self.failed_flushes += 1
+            self._restore(pending)
+            raise
+        self.flushes += 1
+        self._flushed(pending)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("%s failed to flush %d pending entries", type(self).__name__, len(self._pending))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+from collections.abc import (
+    AsyncIterable,
+    Callable,
+)
+from typing import Any
+
+from app.core.metrics import metrics_registry
+from app.core.sketches import BloomFilter
+from .schemas import LinkDTO
+from .settings import link_settings
+
+
+class LinkCache:
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, LinkDTO]] = OrderedDict()
+        self._invalidated: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, short_url: str) -> bool:
+        return self.get(short_url, count=False) is not None
+
+    def get(self, short_url: str, *, count: bool = True) -> LinkDTO | None:
+        entry = self._entries.get(short_url)
+        if entry is not None:
+            expires_at, link = entry
+            if expires_at > self.timer():
+                self._entries.move_to_end(short_url)
+                if count:
+                    self.hits += 1
+                return link
+            del self._entries[short_url]
+        if count:
+            self.misses += 1
+        return None
+
+    def set(self, link: LinkDTO) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[link.short_url] = (self.timer() + self.ttl, link)
+        self._entries.move_to_end(link.short_url)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, short_url: str) -> None:
+        self._entries.pop(short_url, None)
+        if self.maxsize <= 0:
+            return
+        self._invalidated[short_url] = self.timer() + self.ttl
+        self._invalidated.move_to_end(short_url)
+        while len(self._invalidated) > self.maxsize:
+            self._invalidated.popitem(last=False)
+
+    def pop_invalidated(self, short_url: str) -> bool:
+        expires_at = self._invalidated.pop(short_url, None)
+        return expires_at is not None and expires_at > self.timer()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class ShortURLFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rejections = 0
+        self._bloom: BloomFilter | None = None
+        self._loading: BloomFilter | None = None
+
+    def add(self, short_url: str) -> None:
+        if self._bloom is not None:
+            self._bloom.add(short_url)
+        if self._loading is not None:
+            self._loading.add(short_url)
+
+    def might_exist(self, short_url: str) -> bool:
+        if self._bloom is None or short_url in self._bloom:
+            return True
+        self.rejections += 1
+        return False
+
+    async def load(self, short_urls: AsyncIterable[str]) -> None:
+        self._loading = BloomFilter(self.capacity, self.error_rate)
+        try:
+            async for short_url in short_urls:
+                self._loading.add(short_url)
+            self._bloom = self._loading
+        finally:
+            self._loading = None
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "rejections": self.rejections,
+            **(self._bloom.stats() if self._bloom is not None else {}),
+        }
+
+
+link_cache = LinkCache(
+    maxsize=link_settings.cache_size,
+    ttl=link_settings.cache_ttl,
+)
+link_filter = ShortURLFilter(
+    capacity=link_settings.filter_capacity,
+    error_rate=link_settings.filter_error_rate,
+)
+
+metrics_registry.register("links_cache", link_cache.stats)
+metrics_registry.register("links_filter", link_filter.stats)
@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import logging
+from collections import defaultdict
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from datetime import timedelta
+from typing import (
+    Any,
+    Literal,
+)
+
+from app.core.database.bulk import copy_records
+from app.core.database.connection import shard_engines
+from app.core.database.mixins import universal_time
+from app.core.database.partitions import (
+    drop_daily_partitions_before,
+    ensure_daily_partitions,
+)
+from app.core.metrics import metrics_registry
+from app.core.tasks import PeriodicTask
+from .models import click_events_table
+from .settings import link_settings
+from .sharding import shard_for_id
+
+
+logger = logging.getLogger(__name__)
+
+ClickRecord = tuple[Any, ...]
+
+CLICK_EVENT_COLUMNS: list[str] = [column.name for column in click_events_table.columns]
+MAX_REFERRER_LENGTH = 1024
+MAX_USER_AGENT_LENGTH = 512
+
+
+def hash_client_ip(client_ip: str | None) -> bytes | None:
+    if not client_ip:
+        return None
+    return hashlib.blake2b(client_ip.encode(), key=link_settings.click_log_ip_salt.encode(), digest_size=16).digest()
+
+
+def click_record(
+    link_id: int,
+    referrer: str | None = None,
+    user_agent: str | None = None,
+    client_ip: str | None = None,
+) -> ClickRecord:
+    return (
+        universal_time(),
+        link_id,
+        referrer[:MAX_REFERRER_LENGTH] if referrer else None,
+        user_agent[:MAX_USER_AGENT_LENGTH] if user_agent else None,
+        hash_client_ip(client_ip),
+    )
+
+
+class ClickEventLog:
+    def __init__(
+        self,
+        write: Callable[[list[ClickRecord]], Awaitable[None]],
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow: Literal["drop", "block"] = "drop",
+    ):
+        self._write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.dropped = 0
+        self.written = 0
+        self.failed_batches = 0
+        self._queue: asyncio.Queue[ClickRecord] = asyncio.Queue(maxsize=max_queue_size)
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    async def record(self, record: ClickRecord) -> None:
+        if self.overflow == "block":
+            await self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _drain(self, batch: list[ClickRecord]) -> list[ClickRecord]:
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _next_batch(self) -> list[ClickRecord]:
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval)
+        except TimeoutError:
+            return []
+        return self._drain([first])
+
+    async def write(self, batch: list[ClickRecord]) -> None:
+        try:
+            await self._write(batch)
+        except Exception:
+            self.failed_batches += 1
+            self.dropped += len(batch)
+            logger.exception("Failed to write %d click events", len(batch))
+            return
+        self.written += len(batch)
+
+    async def flush(self) -> None:
+        while batch := self._drain([]):
+            await self.write(batch)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            if batch := await self._next_batch():
+                await self.write(batch)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed_batches": self.failed_batches,
+        }
+
+
+async def copy_click_events(records: list[ClickRecord]) -> None:
+    records_by_shard = defaultdict(list)
+    for record in records:
+        records_by_shard[shard_for_id(record[1])].append(record)
+    await asyncio.gather(
+        *(
+            copy_records(shard_engines[shard], click_events_table.name, CLICK_EVENT_COLUMNS, shard_records)
+            for shard, shard_records in records_by_shard.items()
+        )
+    )
+
+
+async def maintain_click_event_partitions() -> None:
+    today = universal_time().date()
+    for engine in shard_engines:
+        async with engine.begin() as connection:
+            await ensure_daily_partitions(
+                connection,
+                click_events_table.name,
+                today - timedelta(days=1),
+                today + timedelta(days=link_settings.click_log_partitions_ahead),
+            )
+            if link_settings.click_log_retention_days:
+                await drop_daily_partitions_before(
+                    connection,
+                    click_events_table.name,
+                    today - timedelta(days=link_settings.click_log_retention_days),
+                )
+
+
+link_click_log = ClickEventLog(
+    write=copy_click_events,
+    max_queue_size=link_settings.click_log_queue_size,
+    batch_size=link_settings.click_log_batch_size,
+    flush_interval=link_settings.click_log_flush_interval,
+    overflow=link_settings.click_log_overflow,
+)
+
+link_click_log_partitions = PeriodicTask(
+    func=maintain_click_event_partitions,
+    interval=3600.0,
+)
+
+metrics_registry.register("links_click_log", link_click_log.stats)
+metrics_registry.register("links_click_log_partitions", link_click_log_partitions.stats)
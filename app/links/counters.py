@@ -0,0 +1,59 @@
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from typing import Any
+
+from app.core.database.sharding import ShardSessions
+from app.core.metrics import metrics_registry
+from app.core.tasks import FlushBuffer
+from .settings import link_settings
+from .sharding import get_link_repository
+
+
+class ClickCounterBuffer(FlushBuffer):
+    def __init__(
+        self,
+        flush: Callable[[dict[int, int]], Awaitable[None]],
+        flush_interval: float,
+        flush_threshold: int,
+    ):
+        super().__init__(flush, flush_interval, flush_threshold)
+        self.flushed_clicks = 0
+
+    def add(self, link_id: int, delta: int = 1) -> None:
+        self._pending[link_id] = self._pending.get(link_id, 0) + delta
+        self._check_threshold()
+
+    def pending(self, link_id: int) -> int:
+        return self._pending.get(link_id, 0)
+
+    def _restore(self, deltas: dict[int, int]) -> None:
+        for link_id, delta in deltas.items():
+            self.add(link_id, delta)
+
+    def _flushed(self, deltas: dict[int, int]) -> None:
+        self.flushed_clicks += sum(deltas.values())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending_links": len(self._pending),
+            "pending_clicks": sum(self._pending.values()),
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "flushed_clicks": self.flushed_clicks,
+        }
+
+
+async def flush_click_counts(deltas: dict[int, int]) -> None:
+    async with ShardSessions() as sessions:
+        await get_link_repository(sessions).increment_many_count_requests(deltas)
+
+
+link_click_counter = ClickCounterBuffer(
+    flush=flush_click_counts,
+    flush_interval=link_settings.click_flush_interval,
+    flush_threshold=link_settings.click_flush_threshold,
+)
+
+metrics_registry.register("links_clicks", link_click_counter.stats)
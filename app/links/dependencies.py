@@ -1,16 +1,22 @@
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database.dependencies import scoped_session_dependency
+from app.core.database.dependencies import shard_sessions_dependency
+from app.core.database.sharding import ShardSessions
 from .repositories import LinkRepository
 from .service import LinkService
+from .sharding import (
+    ShardedLinkRepository,
+    get_link_repository,
+)
 
 
-async def link_repository_dependency(session: Annotated[AsyncSession, Depends(scoped_session_dependency)]):
-    return LinkRepository(session)
+async def link_repository_dependency(sessions: Annotated[ShardSessions, Depends(shard_sessions_dependency)]):
+    return get_link_repository(sessions)
 
 
-async def link_service_dependency(repository: Annotated[LinkRepository, Depends(link_repository_dependency)]):
+async def link_service_dependency(
+    repository: Annotated[LinkRepository | ShardedLinkRepository, Depends(link_repository_dependency)],
+):
     return LinkService(repository=repository)
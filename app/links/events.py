@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from app.core.database.connection import async_engine
+from app.core.database.mixins import universal_time
+from app.core.database.notifications import PostgresListener
+from app.core.database.sharding import ShardSessions
+from app.core.metrics import metrics_registry
+from .cache import (
+    link_cache,
+    link_filter,
+)
+from .schemas import (
+    LinkDTO,
+    LinkEvent,
+)
+from .settings import link_settings
+from .sharding import get_link_repository
+
+
+def apply_link_event(payload: str) -> None:
+    event = LinkEvent.model_validate_json(payload)
+    link_cache.invalidate(event.short_url)
+    if event.action == "created":
+        link_filter.add(event.short_url)
+
+
+async def load_link_filter() -> None:
+    async with ShardSessions() as sessions:
+        await link_filter.load(get_link_repository(sessions).iter_short_urls())
+
+
+async def preload_link_cache(limit: int, window: float) -> list[LinkDTO]:
+    async with ShardSessions() as sessions:
+        items = await get_link_repository(sessions).get_recently_clicked(
+            limit, universal_time() - timedelta(seconds=window)
+        )
+    links = [link for link, _ in items]
+    for link in reversed(links):
+        link_cache.set(link)
+    return links
+
+
+async def resync_link_state() -> None:
+    link_cache.clear()
+    if link_settings.filter_enabled:
+        await load_link_filter()
+
+
+link_events_listener = PostgresListener(
+    engine=async_engine,
+    channel=link_settings.events_channel,
+    on_notification=apply_link_event,
+    on_resync=resync_link_state,
+)
+
+metrics_registry.register("links_events", link_events_listener.stats)
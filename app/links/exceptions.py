@@ -20,3 +20,15 @@ class URLCannotBeEmpty(ApplicationError):
     message = "URL cannot be empty"
     error_code = "url_cannot_be_empty"
     status_code = status.HTTP_400_BAD_REQUEST
+
+
+class InvalidCursor(ApplicationError):
+    message = "Invalid pagination cursor"
+    error_code = "invalid_cursor"
+    status_code = status.HTTP_400_BAD_REQUEST
+
+
+class RollupRangeTooLarge(ApplicationError):
+    message = "Requested time range has too many points"
+    error_code = "rollup_range_too_large"
+    status_code = status.HTTP_400_BAD_REQUEST
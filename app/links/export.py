@@ -0,0 +1,74 @@
+import csv
+import io
+import zlib
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+)
+from typing import (
+    Any,
+    Literal,
+)
+
+from app.core.database.sharding import ShardSessions
+from .schemas import LinkDTO
+from .sharding import get_link_repository
+
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_FIELDS: list[str] = [name for name, field in LinkDTO.model_fields.items() if not field.exclude]
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def encode_ndjson(chunks: AsyncIterable[list[LinkDTO]]) -> AsyncIterator[bytes]:
+    async for links in chunks:
+        yield "".join(f"{link.model_dump_json()}\n" for link in links).encode()
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    data = buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+async def encode_csv(chunks: AsyncIterable[list[LinkDTO]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield _drain(buffer)
+    async for links in chunks:
+        writer.writerows([getattr(link, name) for name in EXPORT_FIELDS] for link in links)
+        yield _drain(buffer)
+
+
+async def gzip_stream(data: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in data:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+EXPORT_ENCODERS: dict[str, Callable[[AsyncIterable[list[LinkDTO]]], AsyncIterator[bytes]]] = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+}
+
+
+async def export_links(
+    export_format: ExportFormat,
+    chunk_size: int,
+    compress: bool = False,
+    **filters: Any,
+) -> AsyncIterator[bytes]:
+    async with ShardSessions() as sessions:
+        data = EXPORT_ENCODERS[export_format](get_link_repository(sessions).stream_links(chunk_size, **filters))
+        if compress:
+            data = gzip_stream(data)
+        async for chunk in data:
+            yield chunk
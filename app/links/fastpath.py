@@ -0,0 +1,89 @@
+import re
+from functools import lru_cache
+from urllib.parse import quote
+
+from fastapi import status
+from starlette.types import (
+    ASGIApp,
+    Receive,
+    Scope,
+    Send,
+)
+
+from app.core.database.sharding import ShardSessions
+from app.core.exceptions import ApplicationError
+from .click_log import (
+    click_record,
+    link_click_log,
+)
+from .router import router
+from .service import LinkService
+from .settings import link_settings
+from .sharding import get_link_repository
+from .visitors import visitor_key
+
+
+@lru_cache(maxsize=link_settings.cache_size)
+def redirect_headers(full_url: str) -> list[tuple[bytes, bytes]]:
+    location = quote(full_url, safe=":/%#?=@[]!$&'()*+,;")
+    return [
+        (b"location", location.encode("latin-1")),
+        (b"content-length", b"0"),
+    ]
+
+
+class RedirectFastPathMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.pattern = re.compile(rf"^{re.escape(router.prefix)}/([^/]+)/$")
+        self.reserved = {
+            route.path.removeprefix(router.prefix).strip("/")
+            for route in router.routes
+            if "{" not in route.path
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+        match = self.pattern.match(scope["path"])
+        if match is None or match.group(1) in self.reserved:
+            return await self.app(scope, receive, send)
+
+        if (b"purpose", b"prefetch") in scope["headers"]:
+            return await self._send(send, status.HTTP_200_OK, [(b"content-length", b"0")])
+
+        headers = dict(scope["headers"])
+        client_ip = scope["client"][0] if scope.get("client") else None
+        user_agent = headers.get(b"user-agent", b"").decode("latin-1")
+        async with ShardSessions() as sessions:
+            try:
+                link = await LinkService(repository=get_link_repository(sessions)).get_link(
+                    match.group(1), visitor_key(client_ip, user_agent)
+                )
+            except ApplicationError as ex:
+                return await self._send_error(send, ex)
+        await self._send(send, status.HTTP_308_PERMANENT_REDIRECT, redirect_headers(link.full_url))
+        if link_settings.click_log_enabled:
+            await link_click_log.record(
+                click_record(
+                    link.id,
+                    referrer=headers.get(b"referer", b"").decode("latin-1"),
+                    user_agent=user_agent,
+                    client_ip=client_ip,
+                )
+            )
+
+    @classmethod
+    async def _send(cls, send: Send, status_code: int, headers: list[tuple[bytes, bytes]], body: bytes = b"") -> None:
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    @classmethod
+    async def _send_error(cls, send: Send, ex: ApplicationError) -> None:
+        body = ex.body
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *((key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in (ex.headers or {}).items()),
+        ]
+        await cls._send(send, ex.status_code, headers, body)
@@ -1,18 +1,94 @@
+from datetime import (
+    date,
+    datetime,
+)
 from typing import Annotated
 
+import sqlalchemy as sa
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
 )
 
-from app.core.database.models import BaseDAO
-from app.core.database.mixins import TimestampMixin
+from app.core.database.models import (
+    BaseDAO,
+    BaseModel,
+)
+from app.core.database.mixins import (
+    TimestampMixin,
+    universal_time,
+)
 
 
 class LinkDAO(BaseDAO, TimestampMixin):
     __tablename__ = 'links'
+    __table_args__ = (
+        sa.Index("links_is_active_id_idx", "is_active", "id"),
+        sa.Index("links_created_at_idx", "created_at"),
+    )
 
-    full_url: Mapped[Annotated[str, mapped_column(unique=True)]]
+    full_url: Mapped[str]
+    full_url_hash: Mapped[Annotated[bytes, mapped_column(sa.LargeBinary(32), unique=True)]]
     short_url: Mapped[Annotated[str, mapped_column(unique=True, nullable=True)]]
     count_requests: Mapped[Annotated[int, mapped_column(default=0)]]
     is_active: Mapped[Annotated[bool, mapped_column(default=True)]]
+
+
+class LinkStatsDAO(BaseModel):
+    __tablename__ = 'link_stats'
+
+    slot: Mapped[Annotated[int, mapped_column(sa.SmallInteger, primary_key=True)]]
+    total_links: Mapped[Annotated[int, mapped_column(default=0)]]
+    active_links: Mapped[Annotated[int, mapped_column(default=0)]]
+    total_clicks: Mapped[Annotated[int, mapped_column(default=0)]]
+
+
+class LinkDailyStatsDAO(BaseModel):
+    __tablename__ = 'link_daily_stats'
+
+    day: Mapped[Annotated[date, mapped_column(primary_key=True)]]
+    slot: Mapped[Annotated[int, mapped_column(sa.SmallInteger, primary_key=True)]]
+    created_links: Mapped[Annotated[int, mapped_column(default=0)]]
+
+
+class LinkTrendSnapshotDAO(BaseModel):
+    __tablename__ = 'link_trend_snapshots'
+
+    worker: Mapped[Annotated[str, mapped_column(primary_key=True)]]
+    window: Mapped[Annotated[str, mapped_column(primary_key=True)]]
+    min_count: Mapped[int]
+    items: Mapped[Annotated[list, mapped_column(sa.JSON)]]
+    updated_at: Mapped[Annotated[datetime, mapped_column(default=universal_time, onupdate=universal_time)]]
+
+
+class LinkClickRollupDAO(BaseModel):
+    __tablename__ = 'link_click_rollups'
+    __table_args__ = (
+        sa.Index("link_click_rollups_granularity_bucket_start_idx", "granularity", "bucket_start"),
+    )
+
+    link_id: Mapped[Annotated[int, mapped_column(primary_key=True)]]
+    granularity: Mapped[Annotated[str, mapped_column(primary_key=True)]]
+    bucket_start: Mapped[Annotated[datetime, mapped_column(primary_key=True)]]
+    clicks: Mapped[Annotated[int, mapped_column(default=0)]]
+
+
+class LinkVisitorSketchDAO(BaseModel):
+    __tablename__ = 'link_visitor_sketches'
+
+    link_id: Mapped[Annotated[int, mapped_column(primary_key=True)]]
+    registers: Mapped[Annotated[bytes, mapped_column(sa.LargeBinary)]]
+    updated_at: Mapped[Annotated[datetime, mapped_column(default=universal_time, onupdate=universal_time)]]
+
+
+click_events_table = sa.Table(
+    'click_events',
+    BaseModel.metadata,
+    sa.Column('clicked_at', sa.DateTime(), nullable=False),
+    sa.Column('link_id', sa.BigInteger(), nullable=False),
+    sa.Column('referrer', sa.String(), nullable=True),
+    sa.Column('user_agent', sa.String(), nullable=True),
+    sa.Column('ip_hash', sa.LargeBinary(16), nullable=True),
+    sa.Index('click_events_link_id_clicked_at_idx', 'link_id', 'clicked_at'),
+    postgresql_partition_by='RANGE (clicked_at)',
+)
@@ -1,43 +1,755 @@
+import random
+from collections import defaultdict
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
+from datetime import (
+    date,
+    datetime,
+)
+from functools import cache
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Integer,
+    Row,
+    Select,
+    Update,
+    bindparam,
+    cast,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database.mixins import universal_time
 from app.core.database.repositories import BaseAlchemyRepository
-from .models import LinkDAO
-from .schemas import LinkDTO
+from app.core.database.sequences import SequenceBlockAllocator
+from app.core.metrics import metrics_registry
+from app.core.sketches import HyperLogLog
+from .models import (
+    LinkClickRollupDAO,
+    LinkDAO,
+    LinkDailyStatsDAO,
+    LinkStatsDAO,
+    LinkTrendSnapshotDAO,
+    LinkVisitorSketchDAO,
+)
+from .schemas import (
+    LinkDailyStatsDTO,
+    LinkDTO,
+    LinkStatsDTO,
+)
+from .settings import link_settings
+from .utils import (
+    GRANULARITY_STEPS,
+    Granularity,
+    base62_decode,
+    truncate_time,
+    url_hash,
+)
+
+
+MAX_ID = 2 ** 63 - 1
+STATS_RECONCILE_LOCK = 0x6C696E6B73
+
+link_id_allocator: SequenceBlockAllocator | None = None
+if link_settings.id_block_size:
+    link_id_allocator = SequenceBlockAllocator("links_id_seq", link_settings.id_block_size)
+    metrics_registry.register("links_ids", link_id_allocator.stats)
+
+
+class LinkStatsRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record(self, *, links: int = 0, active: int = 0, clicks: int = 0) -> None:
+        if not link_settings.stats_enabled or not (links or active or clicks):
+            return
+        slot = random.randrange(link_settings.stats_slots)
+        table = LinkStatsDAO.__table__
+        stmt = insert(table).values(slot=slot, total_links=links, active_links=active, total_clicks=clicks)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.slot],
+                set_={name: table.c[name] + stmt.excluded[name] for name in ("total_links", "active_links", "total_clicks")},
+            )
+        )
+        if links:
+            table = LinkDailyStatsDAO.__table__
+            stmt = insert(table).values(day=universal_time().date(), slot=slot, created_links=links)
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.day, table.c.slot],
+                    set_={"created_links": table.c.created_links + stmt.excluded.created_links},
+                )
+            )
+
+    @classmethod
+    def count_returned_clicks(cls, stmt: Update) -> Select:
+        clicked = stmt.cte("clicked")
+        table = LinkStatsDAO.__table__
+        record = insert(table).from_select(
+            ["slot", "total_links", "active_links", "total_clicks"],
+            select(bindparam("stats_slot", type_=Integer), literal(0), literal(0), func.count())
+            .select_from(clicked)
+            .having(func.count() > 0),
+        )
+        record = record.on_conflict_do_update(
+            index_elements=[table.c.slot],
+            set_={"total_clicks": table.c.total_clicks + record.excluded.total_clicks},
+        )
+        return select(*clicked.c).add_cte(record.cte("recorded_clicks"))
+
+    @classmethod
+    def click_params(cls) -> dict[str, Any]:
+        return {"stats_slot": random.randrange(link_settings.stats_slots)}
+
+    async def get(self, since: date) -> LinkStatsDTO:
+        table = LinkStatsDAO.__table__
+        total_links, active_links, total_clicks = (
+            await self.session.execute(
+                select(*(func.coalesce(func.sum(table.c[name]), 0) for name in ("total_links", "active_links", "total_clicks")))
+            )
+        ).one()
+        table = LinkDailyStatsDAO.__table__
+        days = await self.session.execute(
+            select(table.c.day, func.sum(table.c.created_links))
+            .where(table.c.day >= since)
+            .group_by(table.c.day)
+            .order_by(table.c.day)
+        )
+        return LinkStatsDTO(
+            total_links=total_links,
+            active_links=active_links,
+            inactive_links=total_links - active_links,
+            total_clicks=total_clicks,
+            created_per_day=[LinkDailyStatsDTO(day=day, created_links=created_links) for day, created_links in days],
+        )
+
+    async def reconcile(self) -> bool:
+        if not await self.session.scalar(select(func.pg_try_advisory_xact_lock(STATS_RECONCILE_LOCK))):
+            await self.session.rollback()
+            return False
+        # Each statement reads links and the counters from one snapshot and adds the difference,
+        # so writers committing meanwhile are neither blocked nor lost.
+        links = LinkDAO.__table__
+        table = LinkStatsDAO.__table__
+        names = ("total_links", "active_links", "total_clicks")
+        actual = select(
+            func.count().label("total_links"),
+            func.count().filter(links.c.is_active.is_(True)).label("active_links"),
+            func.coalesce(func.sum(links.c.count_requests), 0).label("total_clicks"),
+        ).subquery()
+        recorded = select(*(func.coalesce(func.sum(table.c[name]), 0).label(name) for name in names)).subquery()
+        drift = [(actual.c[name] - recorded.c[name]).label(name) for name in names]
+        stmt = insert(table).from_select(
+            ["slot", *names],
+            select(literal(0), *drift)
+            .select_from(actual.join(recorded, true()))
+            .where(or_(*(value != 0 for value in drift))),
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.slot],
+                set_={name: table.c[name] + stmt.excluded[name] for name in names},
+            )
+        )
+        table = LinkDailyStatsDAO.__table__
+        day = cast(links.c.created_at, Date)
+        actual = select(day.label("day"), func.count().label("created_links")).group_by(day).subquery()
+        recorded = (
+            select(table.c.day, func.sum(table.c.created_links).label("created_links"))
+            .group_by(table.c.day)
+            .subquery()
+        )
+        drift = func.coalesce(actual.c.created_links, 0) - func.coalesce(recorded.c.created_links, 0)
+        stmt = insert(table).from_select(
+            ["day", "slot", "created_links"],
+            select(func.coalesce(actual.c.day, recorded.c.day), literal(0), drift)
+            .select_from(actual.join(recorded, actual.c.day == recorded.c.day, full=True))
+            .where(drift != 0),
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.day, table.c.slot],
+                set_={"created_links": table.c.created_links + stmt.excluded.created_links},
+            )
+        )
+        await self.session.commit()
+        return True
+
+class LinkRollupRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, deltas: dict[tuple[int, datetime], int], chunk_size: int = 1000) -> None:
+        table = LinkClickRollupDAO.__table__
+        buckets = defaultdict(int)
+        for (link_id, at), delta in deltas.items():
+            for granularity in GRANULARITY_STEPS:
+                buckets[link_id, granularity, truncate_time(at, granularity)] += delta
+        rows = [
+            {"link_id": link_id, "granularity": granularity, "bucket_start": bucket_start, "clicks": clicks}
+            for (link_id, granularity, bucket_start), clicks in sorted(buckets.items())
+        ]
+        for start in range(0, len(rows), chunk_size):
+            stmt = insert(table).values(rows[start:start + chunk_size])
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.link_id, table.c.granularity, table.c.bucket_start],
+                    set_={"clicks": table.c.clicks + stmt.excluded.clicks},
+                )
+            )
+        await self.session.commit()
+
+    async def get_series(
+        self,
+        link_id: int,
+        granularity: Granularity,
+        start: datetime,
+        end: datetime,
+    ) -> list[tuple[datetime, int]]:
+        table = LinkClickRollupDAO.__table__
+        stmt = (
+            select(table.c.bucket_start, table.c.clicks)
+            .where(
+                table.c.link_id == link_id,
+                table.c.granularity == granularity,
+                table.c.bucket_start >= start,
+                table.c.bucket_start < end,
+            )
+            .order_by(table.c.bucket_start)
+        )
+        return [(bucket_start, clicks) for bucket_start, clicks in await self.session.execute(stmt)]
+
+    async def delete_before(self, granularity: Granularity, before: datetime, batch_size: int = 10_000) -> int:
+        table = LinkClickRollupDAO.__table__
+        batch = (
+            select(table.c.link_id, table.c.granularity, table.c.bucket_start)
+            .where(table.c.granularity == granularity, table.c.bucket_start < before)
+            .limit(batch_size)
+        )
+        deleted = 0
+        while True:
+            result = await self.session.execute(
+                delete(table).where(tuple_(table.c.link_id, table.c.granularity, table.c.bucket_start).in_(batch))
+            )
+            await self.session.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+
+
+class LinkVisitorRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def merge(self, sketches: dict[int, HyperLogLog], chunk_size: int = 500) -> None:
+        table = LinkVisitorSketchDAO.__table__
+        now = universal_time()
+        link_ids = sorted(sketches)
+        for start in range(0, len(link_ids), chunk_size):
+            chunk = link_ids[start:start + chunk_size]
+            inserted = set(
+                await self.session.scalars(
+                    insert(table)
+                    .values(
+                        [
+                            {"link_id": link_id, "registers": sketches[link_id].to_bytes(), "updated_at": now}
+                            for link_id in chunk
+                        ]
+                    )
+                    .on_conflict_do_nothing()
+                    .returning(table.c.link_id)
+                )
+            )
+            existing = await self.session.execute(
+                select(table.c.link_id, table.c.registers)
+                .where(table.c.link_id.in_([link_id for link_id in chunk if link_id not in inserted]))
+                .order_by(table.c.link_id)
+                .with_for_update()
+            )
+            if rows := [
+                {
+                    "sketch_id": link_id,
+                    "sketch_registers": HyperLogLog.from_bytes(registers).merge(sketches[link_id]).to_bytes(),
+                }
+                for link_id, registers in existing
+            ]:
+                await self.session.execute(
+                    update(table)
+                    .where(table.c.link_id == bindparam("sketch_id"))
+                    .values(registers=bindparam("sketch_registers"), updated_at=now),
+                    rows,
+                )
+        await self.session.commit()
+
+    async def get(self, link_id: int) -> HyperLogLog | None:
+        table = LinkVisitorSketchDAO.__table__
+        registers = await self.session.scalar(select(table.c.registers).where(table.c.link_id == link_id))
+        return None if registers is None else HyperLogLog.from_bytes(registers)
+
+
+class LinkTrendRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def save(self, worker: str, summaries: dict[str, tuple[list[tuple[str, int, int]], int]]) -> None:
+        table = LinkTrendSnapshotDAO.__table__
+        stmt = insert(table).values(
+            [
+                {"worker": worker, "window": window, "items": items, "min_count": min_count, "updated_at": universal_time()}
+                for window, (items, min_count) in summaries.items()
+            ]
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.worker, table.c.window],
+                set_={name: stmt.excluded[name] for name in ("items", "min_count", "updated_at")},
+            )
+        )
+        await self.session.commit()
+
+    async def get_recent(
+        self,
+        window: str,
+        since: datetime,
+        exclude_worker: str | None = None,
+    ) -> list[tuple[list[tuple[str, int, int]], int]]:
+        table = LinkTrendSnapshotDAO.__table__
+        stmt = select(table.c["items"], table.c.min_count).where(table.c.window == window, table.c.updated_at >= since)
+        if exclude_worker is not None:
+            stmt = stmt.where(table.c.worker != exclude_worker)
+        return [(items, min_count) for items, min_count in await self.session.execute(stmt)]
 
 
 class LinkRepository(BaseAlchemyRepository[LinkDAO, LinkDTO]):
     model_type = LinkDAO
     schema_type = LinkDTO
 
-    async def flush_create(self, **data: Any):
-        instance = LinkDAO(**{key: value for key, value in data.items() if not callable(value)})
-        self.session.add(instance)
-        await self.session.flush()
-        instance.update(**{key: value(instance.id) for key, value in data.items() if callable(value)})
+    def __init__(
+        self,
+        session: AsyncSession,
+        id_allocator: SequenceBlockAllocator | None = None,
+        replica: AsyncSession | None = None,
+    ):
+        super().__init__(session, replica)
+        self.id_allocator = link_id_allocator if id_allocator is None else id_allocator
+        self.stats = LinkStatsRepository(session)
+        self.rollups = LinkRollupRepository(session)
+        self.visitors = LinkVisitorRepository(session)
+
+    @property
+    def _columns(self):
+        table = self.model_type.__table__
+        return table.c.id, table.c.full_url, table.c.short_url, table.c.count_requests, table.c.is_active
+
+    @classmethod
+    def _evaluate(cls, data: list[dict[str, Any]], ids: list[int]) -> list[dict[str, Any]]:
+        columns = {key: value(ids) for key, value in data[0].items() if callable(value)} if data else {}
+        return [{key: values[index] for key, values in columns.items()} for index in range(len(ids))]
+
+    async def _insert_values(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        data = [{**item, "full_url_hash": url_hash(item["full_url"])} for item in data]
+        if self.id_allocator is None:
+            return [{key: value for key, value in item.items() if not callable(value)} for item in data]
+        ids = await self.id_allocator.next_ids(self.session, len(data))
+        return [{"id": id_, **item, **computed} for id_, item, computed in zip(ids, data, self._evaluate(data, ids))]
+
+    async def _complete_created(self, data: dict[str, dict[str, Any]], rows: Iterable[Row]) -> list[LinkDTO]:
+        values = [row._asdict() for row in rows]
+        if self.id_allocator is None and values:
+            computed = self._evaluate([data[item["full_url"]] for item in values], [item["id"] for item in values])
+            if computed[0]:
+                table = self.model_type.__table__
+                await self.session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("link_id"))
+                    .values({key: bindparam(f"new_{key}") for key in computed[0]}),
+                    [
+                        {"link_id": item["id"], **{f"new_{key}": value for key, value in item_computed.items()}}
+                        for item, item_computed in zip(values, computed)
+                    ],
+                )
+                for item, item_computed in zip(values, computed):
+                    item.update(item_computed)
+        return [self.schema_type.model_validate(item) for item in values]
+
+    async def get_or_create(self, **data: Any) -> tuple[LinkDTO, bool]:
+        table = self.model_type.__table__
+        existing = select(*self._columns, literal(False).label("created")).where(
+            table.c.full_url_hash == url_hash(data["full_url"]),
+            table.c.full_url == data["full_url"],
+        )
+        if self.id_allocator is not None:
+            row = (await self.session.execute(existing)).one_or_none()
+            if row is not None:
+                await self.session.commit()
+                return self.schema_type.model_validate(row), False
+        [values] = await self._insert_values([data])
+        inserted = (
+            insert(table)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=[table.c.full_url_hash])
+            .returning(*self._columns, literal(True).label("created"))
+            .cte("inserted")
+        )
+        row = (await self.session.execute(
+            select(*inserted.c).union_all(existing.where(~select(inserted.c.id).exists()))
+        )).one_or_none()
+        if row is None:
+            await self.session.commit()
+            row = (await self.session.execute(existing)).one()
+        if row.created:
+            [link] = await self._complete_created({row.full_url: data}, [row])
+            await self.stats.record(links=1, active=int(link.is_active))
+        else:
+            link = self.schema_type.model_validate(row)
         await self.session.commit()
-        return self.schema_type.model_validate(instance)
+        return link, row.created
+
+    async def bulk_create(self, data: list[dict[str, Any]], chunk_size: int = 1000) -> list[LinkDTO]:
+        table = self.model_type.__table__
+        links = []
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start:start + chunk_size]
+            rows = await self.session.execute(
+                insert(table).on_conflict_do_nothing(index_elements=[table.c.full_url_hash]).returning(*self._columns),
+                await self._insert_values(chunk),
+            )
+            links.extend(await self._complete_created({item["full_url"]: item for item in chunk}, rows))
+        await self.stats.record(links=len(links), active=sum(link.is_active for link in links))
+        await self.session.commit()
+        return links
+
+    async def get_by_full_urls(self, full_urls: list[str], chunk_size: int = 1000) -> dict[str, LinkDTO]:
+        links = {}
+        for start in range(0, len(full_urls), chunk_size):
+            chunk = set(full_urls[start:start + chunk_size])
+            stmt = select(self.model_type).where(
+                self.model_type.full_url_hash.in_(list(map(url_hash, chunk)))  # noqa
+            )
+            for instance in await self.session.scalars(stmt):
+                if instance.full_url in chunk:
+                    links[instance.full_url] = self.schema_type.model_validate(instance)
+        return links
 
     async def get_by_full_url(self, full_url: str) -> LinkDTO | None:
-        stmt = select(self.model_type).where(self.model_type.full_url == full_url)  # noqa
-        instance = await self.session.scalar(stmt)
+        stmt = select(self.model_type).where(
+            self.model_type.full_url_hash == url_hash(full_url),  # noqa
+            self.model_type.full_url == full_url,  # noqa
+        )
+        instance = await self._read(lambda session: session.scalar(stmt))
         if instance is None:
             return None
         return self.schema_type.model_validate(instance)
 
-    async def get_by_short_url(self, short_url: str) -> LinkDTO | None:
-        stmt = select(self.model_type).where(self.model_type.short_url == short_url)  # noqa
-        instance = await self.session.scalar(stmt)
+    @classmethod
+    def _decode_id(cls, short_url: str) -> int | None:
+        try:
+            id_ = base62_decode(short_url)
+        except ValueError:
+            return None
+        return id_ if id_ <= MAX_ID else None
+
+    @classmethod
+    def _short_url_criteria(cls, short_url: str) -> tuple[ColumnElement[bool], ...] | None:
+        table = cls.model_type.__table__
+        if not link_settings.resolve_by_id:
+            return (table.c.short_url == short_url,)
+        if (id_ := cls._decode_id(short_url)) is None:
+            return None
+        return table.c.id == id_, table.c.short_url == short_url
+
+    async def get_by_short_url(self, short_url: str, primary: bool = False) -> LinkDTO | None:
+        if (criteria := self._short_url_criteria(short_url)) is None:
+            return None
+        stmt = select(self.model_type).where(*criteria)
+        instance = await self._read(lambda session: session.scalar(stmt), primary=primary)
         if instance is None:
             return None
         return self.schema_type.model_validate(instance)
 
-    async def update_by_full_url(self, full_url: str, **data: Any) -> LinkDTO | None:
-        stmt = select(self.model_type).where(self.model_type.full_url == full_url)  # noqa
-        instance = await self.session.scalar(stmt)
-        if instance is None:
+    @classmethod
+    def _page_criteria(
+        cls,
+        is_active: bool | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[ColumnElement[bool]]:
+        table = cls.model_type.__table__
+        criteria = []
+        if is_active is not None:
+            criteria.append(table.c.is_active.is_(is_active))
+        if created_from is not None:
+            criteria.append(table.c.created_at >= created_from)
+        if created_to is not None:
+            criteria.append(table.c.created_at < created_to)
+        return criteria
+
+    async def get_page(self, limit: int, after_id: int | None = None, **filters: Any) -> list[LinkDTO]:
+        table = self.model_type.__table__
+        stmt = select(*self._columns).where(*self._page_criteria(**filters)).order_by(table.c.id).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(table.c.id > after_id)
+        rows = await self._read(lambda session: session.execute(stmt), fallback=False)
+        return [self.schema_type.model_validate(row) for row in rows]
+
+    async def estimate_count(self, **filters: Any) -> int:
+        table = self.model_type.__table__
+        return await self.estimate_rows(select(table.c.id).where(*self._page_criteria(**filters)))
+
+    async def stream_links(self, chunk_size: int = 10_000, **filters: Any) -> AsyncIterator[list[LinkDTO]]:
+        table = self.model_type.__table__
+        stmt = (
+            select(*self._columns)
+            .where(*self._page_criteria(**filters))
+            .order_by(table.c.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for rows in (await self.session.stream(stmt)).partitions():
+            yield [self.schema_type.model_validate(row) for row in rows]
+
+    async def iter_short_urls(self, chunk_size: int = 10_000) -> AsyncIterator[str]:
+        stmt = (
+            select(self.model_type.short_url)
+            .where(self.model_type.short_url.is_not(None))
+            .execution_options(yield_per=chunk_size)
+        )
+        async for short_url in await self.session.stream_scalars(stmt):
+            yield short_url
+
+    async def count_request_by_short_url(self, short_url: str) -> LinkDTO | None:
+        if (criteria := self._short_url_criteria(short_url)) is None:
             return None
-        instance.update(**data)
+        table = self.model_type.__table__
+        stmt = (
+            update(table)
+            .where(*criteria, table.c.is_active.is_(True))
+            .values(count_requests=table.c.count_requests + 1)
+            .returning(*self._columns)
+        )
+        params = {}
+        if link_settings.stats_enabled:
+            stmt, params = self.stats.count_returned_clicks(stmt), self.stats.click_params()
+        row = (await self.session.execute(stmt, params)).one_or_none()
         await self.session.commit()
-        return self.schema_type.model_validate(instance)
+        return None if row is None else self.schema_type.model_validate(row)
+
+    async def set_active(self, id_: int, is_active: bool) -> LinkDTO | None:
+        table = self.model_type.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == id_, table.c.is_active.is_not(is_active))
+            .values(is_active=is_active)
+            .returning(*self._columns)
+        )
+        row = (await self.session.execute(stmt)).one_or_none()
+        if row is None:
+            await self.session.commit()
+            return await self.get(id_)
+        await self.stats.record(active=1 if is_active else -1)
+        await self.session.commit()
+        return self.schema_type.model_validate(row)
+
+    async def get_stats(self, since: date) -> LinkStatsDTO:
+        return await self.stats.get(since)
+
+    async def add_click_rollups(self, deltas: dict[tuple[int, datetime], int]) -> None:
+        await self.rollups.add(deltas)
+
+    async def get_click_rollups(
+        self,
+        link_id: int,
+        granularity: Granularity,
+        start: datetime,
+        end: datetime,
+    ) -> list[tuple[datetime, int]]:
+        return await self.rollups.get_series(link_id, granularity, start, end)
+
+    async def get_recently_clicked(self, limit: int, since: datetime) -> list[tuple[LinkDTO, int]]:
+        table = self.model_type.__table__
+        rollups = LinkClickRollupDAO.__table__
+        clicks = (
+            select(rollups.c.link_id, func.sum(rollups.c.clicks).label("clicks"))
+            .where(
+                rollups.c.granularity == "hour",
+                rollups.c.bucket_start >= truncate_time(since, "hour"),
+            )
+            .group_by(rollups.c.link_id)
+            .order_by(func.sum(rollups.c.clicks).desc())
+            .limit(limit)
+            .subquery()
+        )
+        stmt = (
+            select(*self._columns, clicks.c.clicks)
+            .join_from(table, clicks, table.c.id == clicks.c.link_id)
+            .order_by(clicks.c.clicks.desc())
+        )
+        rows = await self._read(lambda session: session.execute(stmt), fallback=False)
+        return [(self.schema_type.model_validate(row), row.clicks) for row in rows]
+
+    async def merge_visitor_sketches(self, sketches: dict[int, HyperLogLog]) -> None:
+        await self.visitors.merge(sketches)
+
+    async def get_visitor_sketch(self, link_id: int) -> HyperLogLog | None:
+        return await self.visitors.get(link_id)
+
+    async def increment_many_count_requests(self, deltas: dict[int, int]) -> None:
+        table = self.model_type.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("link_id"))
+            .values(count_requests=table.c.count_requests + bindparam("delta"))
+        )
+        await self.session.execute(
+            stmt,
+            [{"link_id": link_id, "delta": delta} for link_id, delta in sorted(deltas.items())],
+        )
+        await self.stats.record(clicks=sum(deltas.values()))
+        await self.session.commit()
+
+
+class CoreLinkRepository(LinkRepository):
+    table = LinkDAO.__table__
+    columns = (
+        table.c.id,
+        table.c.full_url,
+        table.c.short_url,
+        table.c.count_requests,
+        table.c.is_active,
+    )
+    select_by_id = select(*columns).where(table.c.id == bindparam("link_id"))
+    select_by_short_url = select(*columns).where(table.c.short_url == bindparam("link_short_url"))
+    select_by_id_code = select(*columns).where(
+        table.c.id == bindparam("link_id"),
+        table.c.short_url == bindparam("link_short_url"),
+    )
+    select_by_full_url = select(*columns).where(
+        table.c.full_url_hash == bindparam("full_url_hash"),
+        table.c.full_url == bindparam("full_url"),
+    )
+    select_by_full_url_hashes = select(*columns).where(
+        table.c.full_url_hash.in_(bindparam("full_url_hashes", expanding=True))
+    )
+    increment_count = (
+        update(table)
+        .values(count_requests=table.c.count_requests + 1)
+        .returning(*columns)
+    )
+    increment_by_short_url = increment_count.where(
+        table.c.short_url == bindparam("link_short_url"),
+        table.c.is_active.is_(True),
+    )
+    increment_by_id_code = increment_count.where(
+        table.c.id == bindparam("link_id"),
+        table.c.short_url == bindparam("link_short_url"),
+        table.c.is_active.is_(True),
+    )
+    count_by_short_url = LinkStatsRepository.count_returned_clicks(increment_by_short_url)
+    count_by_id_code = LinkStatsRepository.count_returned_clicks(increment_by_id_code)
+
+    @classmethod
+    def _to_dto(cls, row: Row | None) -> LinkDTO | None:
+        return None if row is None else cls.schema_type.model_validate(row)
+
+    @classmethod
+    async def _one(cls, session: AsyncSession, stmt: Any, params: dict[str, Any]) -> Row | None:
+        return (await session.execute(stmt, params)).one_or_none()
+
+    @classmethod
+    def _short_url_params(cls, short_url: str) -> dict[str, Any] | None:
+        if not link_settings.resolve_by_id:
+            return {"link_short_url": short_url}
+        if (id_ := cls._decode_id(short_url)) is None:
+            return None
+        return {"link_id": id_, "link_short_url": short_url}
+
+    @classmethod
+    @cache
+    def _page_statement(cls, filters: tuple[str, ...]) -> Select:
+        table = cls.table
+        criteria = {
+            "after_id": table.c.id > bindparam("after_id"),
+            "is_active": table.c.is_active == bindparam("is_active"),
+            "created_from": table.c.created_at >= bindparam("created_from"),
+            "created_to": table.c.created_at < bindparam("created_to"),
+        }
+        return (
+            select(*cls.columns)
+            .where(*(criteria[name] for name in filters))
+            .order_by(table.c.id)
+            .limit(bindparam("limit"))
+        )
+
+    async def get(self, id_: int) -> LinkDTO | None:
+        stmt, params = self.select_by_id, {"link_id": id_}
+        return self._to_dto(await self._read(lambda session: self._one(session, stmt, params)))
+
+    async def get_all(self, **data: Any) -> list[LinkDTO]:
+        stmt = select(*self.columns).filter_by(**data)
+        rows = await self._read(lambda session: session.execute(stmt), fallback=False)
+        return [self.schema_type.model_validate(row) for row in rows]
+
+    async def get_by_full_urls(self, full_urls: list[str], chunk_size: int = 1000) -> dict[str, LinkDTO]:
+        links = {}
+        for start in range(0, len(full_urls), chunk_size):
+            chunk = set(full_urls[start:start + chunk_size])
+            rows = await self.session.execute(
+                self.select_by_full_url_hashes,
+                {"full_url_hashes": list(map(url_hash, chunk))},
+            )
+            for row in rows:
+                if row.full_url in chunk:
+                    links[row.full_url] = self.schema_type.model_validate(row)
+        return links
+
+    async def get_by_full_url(self, full_url: str) -> LinkDTO | None:
+        stmt = self.select_by_full_url
+        params = {"full_url_hash": url_hash(full_url), "full_url": full_url}
+        return self._to_dto(await self._read(lambda session: self._one(session, stmt, params)))
+
+    async def get_by_short_url(self, short_url: str, primary: bool = False) -> LinkDTO | None:
+        if (params := self._short_url_params(short_url)) is None:
+            return None
+        stmt = self.select_by_id_code if link_settings.resolve_by_id else self.select_by_short_url
+        return self._to_dto(await self._read(lambda session: self._one(session, stmt, params), primary=primary))
+
+    async def get_page(self, limit: int, after_id: int | None = None, **filters: Any) -> list[LinkDTO]:
+        params = {"after_id": after_id, **filters}
+        params = {key: value for key, value in params.items() if value is not None}
+        stmt = self._page_statement(tuple(sorted(params)))
+        params["limit"] = limit
+        rows = await self._read(lambda session: session.execute(stmt, params), fallback=False)
+        return [self.schema_type.model_validate(row) for row in rows]
+
+    async def count_request_by_short_url(self, short_url: str) -> LinkDTO | None:
+        if (params := self._short_url_params(short_url)) is None:
+            return None
+        if link_settings.stats_enabled:
+            stmt = self.count_by_id_code if link_settings.resolve_by_id else self.count_by_short_url
+            params |= self.stats.click_params()
+        elif link_settings.resolve_by_id:
+            stmt = self.increment_by_id_code
+        else:
+            stmt = self.increment_by_short_url
+        row = await self._one(self.session, stmt, params)
+        await self.session.commit()
+        return self._to_dto(row)
+
+
+link_repository_types: dict[str, type[LinkRepository]] = {
+    "orm": LinkRepository,
+    "core": CoreLinkRepository,
+}
@@ -0,0 +1,61 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+from app.core.database.connection import shard_session_factories
+from app.core.database.mixins import universal_time
+from app.core.database.sharding import ShardSessions
+from app.core.metrics import metrics_registry
+from app.core.tasks import PeriodicTask
+from .counters import ClickCounterBuffer
+from .repositories import LinkRollupRepository
+from .settings import link_settings
+from .sharding import get_link_repository
+from .utils import truncate_time
+
+
+class ClickRollupBuffer(ClickCounterBuffer):
+    def add(self, link_id: int, delta: int = 1) -> None:
+        self.add_at(link_id, universal_time(), delta)
+
+    def add_at(self, link_id: int, at: datetime, delta: int = 1) -> None:
+        key = link_id, truncate_time(at, "minute")
+        self._pending[key] = self._pending.get(key, 0) + delta
+        self._check_threshold()
+
+    def pending(self, link_id: int) -> int:
+        return sum(delta for (pending_id, _), delta in self._pending.items() if pending_id == link_id)
+
+    def _restore(self, deltas: dict[tuple[int, datetime], int]) -> None:
+        for (link_id, minute), delta in deltas.items():
+            self.add_at(link_id, minute, delta)
+
+
+async def flush_click_rollups(deltas: dict[tuple[int, datetime], int]) -> None:
+    async with ShardSessions() as sessions:
+        await get_link_repository(sessions).add_click_rollups(deltas)
+
+
+async def prune_click_rollups() -> None:
+    now = universal_time()
+    for session_factory in shard_session_factories:
+        async with session_factory() as session:
+            repository = LinkRollupRepository(session)
+            await repository.delete_before("minute", now - timedelta(seconds=link_settings.rollups_minute_retention))
+            await repository.delete_before("hour", now - timedelta(seconds=link_settings.rollups_hour_retention))
+
+
+link_click_rollups = ClickRollupBuffer(
+    flush=flush_click_rollups,
+    flush_interval=link_settings.rollups_flush_interval,
+    flush_threshold=link_settings.click_flush_threshold,
+)
+
+link_rollups_retention = PeriodicTask(
+    func=prune_click_rollups,
+    interval=600.0,
+)
+
+metrics_registry.register("links_rollups", link_click_rollups.stats)
+metrics_registry.register("links_rollups_retention", link_rollups_retention.stats)
@@ -1,8 +1,10 @@
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import (
     APIRouter,
     status,
+    Body,
     Depends,
     Path,
     Request,
@@ -11,14 +13,43 @@ from fastapi import (
 from fastapi.responses import (
     RedirectResponse,
     Response,
+    StreamingResponse,
 )
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
 
+from app.core.database.dependencies import shard_sessions_dependency
+from app.core.database.sharding import ShardSessions
+from app.core.responses import TypedJSONResponse
+from .click_log import (
+    click_record,
+    link_click_log,
+)
 from .service import LinkService
 from .schemas import (
     LinkDTO,
+    LinkPageDTO,
+    LinkVisitorsDTO,
+    LinkStatsDTO,
+    TrendingLinkDTO,
+    ClickSeriesDTO,
     ShortLinkCreateDTO,
+    ShortLinkBatchResultDTO,
 )
 from .dependencies import link_service_dependency
+from .export import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    export_links,
+)
+from .settings import link_settings
+from .sharding import get_link_repository
+from .trends import TrendWindow
+from .utils import (
+    Granularity,
+    to_naive_utc,
+)
+from .visitors import visitor_key
 
 
 router = APIRouter(
@@ -26,6 +57,11 @@ router = APIRouter(
     tags=["Links"],
 )
 
+batch_result_adapter = TypeAdapter(list[ShortLinkBatchResultDTO])
+link_page_adapter = TypeAdapter(LinkPageDTO)
+trending_adapter = TypeAdapter(list[TrendingLinkDTO])
+click_series_adapter = TypeAdapter(ClickSeriesDTO)
+
 
 @router.post("/shorten/")
 async def shorten_link(
@@ -35,12 +71,71 @@ async def shorten_link(
     return await service.shorten_url(link)
 
 
-@router.get("/list/")
+@router.post("/shorten/batch/", response_model=list[ShortLinkBatchResultDTO])
+async def shorten_links(
+    links: Annotated[list[ShortLinkCreateDTO], Body(max_length=link_settings.batch_max_size)],
+    service: Annotated[LinkService, Depends(link_service_dependency)],
+) -> Response:
+    return TypedJSONResponse(batch_result_adapter, await service.shorten_urls(links))
+
+
+@router.get("/list/", response_model=LinkPageDTO)
 async def get_links(
     service: Annotated[LinkService, Depends(link_service_dependency)],
+    limit: Annotated[int, Query(ge=1, le=link_settings.page_max_size)] = link_settings.page_default_size,
+    cursor: Annotated[str | None, Query] = None,
+    is_active: Annotated[bool | None, Query] = None,
+    created_from: Annotated[datetime | None, Query] = None,
+    created_to: Annotated[datetime | None, Query] = None,
+    estimate_total: Annotated[bool, Query] = False,
+) -> Response:
+    page = await service.get_links(limit, cursor, is_active, created_from, created_to, estimate_total)
+    return TypedJSONResponse(link_page_adapter, page)
+
+
+@router.get("/stats/")
+async def get_stats(
+    service: Annotated[LinkService, Depends(link_service_dependency)],
+    days: Annotated[int, Query(ge=1, le=3660)] = 30,
+) -> LinkStatsDTO:
+    return await service.get_stats(days)
+
+
+@router.get("/trending/", response_model=list[TrendingLinkDTO])
+async def get_trending(
+    service: Annotated[LinkService, Depends(link_service_dependency)],
+    window: Annotated[TrendWindow, Query] = "1h",
+    limit: Annotated[int, Query(ge=1, le=link_settings.trends_capacity)] = 10,
+) -> Response:
+    return TypedJSONResponse(trending_adapter, await service.get_trending(window, limit))
+
+
+@router.get("/export/")
+async def export_links_stream(
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    gzip: Annotated[bool, Query] = False,
+    chunk_size: Annotated[int, Query(ge=1, le=link_settings.export_max_chunk_size)] = link_settings.export_chunk_size,
     is_active: Annotated[bool | None, Query] = None,
-) -> list[LinkDTO]:
-    return await service.get_links(is_active)
+    created_from: Annotated[datetime | None, Query] = None,
+    created_to: Annotated[datetime | None, Query] = None,
+) -> StreamingResponse:
+    filename = f"links.{export_format}"
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+    if gzip:
+        filename = f"{filename}.gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        export_links(
+            export_format,
+            chunk_size,
+            gzip,
+            is_active=is_active,
+            created_from=to_naive_utc(created_from),
+            created_to=to_naive_utc(created_to),
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{short_url}/deactivate/")
@@ -59,17 +154,54 @@ async def activate_link(
     return await service.activate_link(short_url)
 
 
-@router.get("/{short_url}/")
+@router.get("/{short_url}/clicks/", response_model=ClickSeriesDTO)
+async def get_click_series(
+    short_url: Annotated[str, Path],
+    service: Annotated[LinkService, Depends(link_service_dependency)],
+    granularity: Annotated[Granularity, Query] = "hour",
+    start: Annotated[datetime | None, Query] = None,
+    end: Annotated[datetime | None, Query] = None,
+) -> Response:
+    return TypedJSONResponse(click_series_adapter, await service.get_click_series(short_url, granularity, start, end))
+
+
+@router.get("/{short_url}/visitors/")
+async def get_unique_visitors(
+    short_url: Annotated[str, Path],
+    service: Annotated[LinkService, Depends(link_service_dependency)],
+) -> LinkVisitorsDTO:
+    return await service.get_unique_visitors(short_url)
+
+
+@router.api_route("/{short_url}/", methods=["GET", "HEAD"])
 async def open_link(
     request: Request,
     short_url: Annotated[str, Path],
-    service: Annotated[LinkService, Depends(link_service_dependency)],
+    sessions: Annotated[ShardSessions, Depends(shard_sessions_dependency)],
 ) -> Response:
     if request.headers.get("Purpose") == "prefetch":
         return Response()
 
-    if link := await service.get_link(short_url):
+    service = LinkService(repository=get_link_repository(sessions))
+    if request.method == "HEAD":
+        link = await service.peek_link(short_url)
+        return RedirectResponse(url=link.full_url, status_code=status.HTTP_308_PERMANENT_REDIRECT)
+
+    client_ip = request.client.host if request.client else None
+    if link := await service.get_link(short_url, visitor_key(client_ip, request.headers.get("user-agent"))):
+        background = None
+        if link_settings.click_log_enabled:
+            background = BackgroundTask(
+                link_click_log.record,
+                click_record(
+                    link.id,
+                    referrer=request.headers.get("referer"),
+                    user_agent=request.headers.get("user-agent"),
+                    client_ip=client_ip,
+                ),
+            )
         return RedirectResponse(
             url=link.full_url,
             status_code=status.HTTP_308_PERMANENT_REDIRECT,
+            background=background,
         )
@@ -1,4 +1,12 @@
-from typing import Annotated
+from datetime import (
+    date,
+    datetime,
+)
+from enum import StrEnum
+from typing import (
+    Annotated,
+    Literal,
+)
 
 from pydantic import (
     BaseModel,
@@ -10,12 +18,69 @@ from pydantic import (
 class LinkDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    id: Annotated[int, Field(exclude=True, default=-1)]
+    id: Annotated[int, Field(exclude=True)]
     full_url: str
     short_url: str
     count_requests: int
     is_active: bool
 
 
+class LinkVisitorsDTO(LinkDTO):
+    unique_visitors: int
+
+
+class LinkPageDTO(BaseModel):
+    items: list[LinkDTO]
+    next_cursor: str | None = None
+    total_estimate: int | None = None
+
+
+class LinkDailyStatsDTO(BaseModel):
+    day: date
+    created_links: int
+
+
+class LinkStatsDTO(BaseModel):
+    total_links: int = 0
+    active_links: int = 0
+    inactive_links: int = 0
+    total_clicks: int = 0
+    created_per_day: list[LinkDailyStatsDTO] = []
+
+
+class ClickPointDTO(BaseModel):
+    bucket_start: datetime
+    clicks: int
+
+
+class ClickSeriesDTO(BaseModel):
+    short_url: str
+    granularity: str
+    points: list[ClickPointDTO]
+
+
+class TrendingLinkDTO(BaseModel):
+    short_url: str
+    count: int
+    error: int
+
+
 class ShortLinkCreateDTO(BaseModel):
     full_url: str
+
+
+class ShortLinkBatchStatus(StrEnum):
+    CREATED = "created"
+    EXISTING = "existing"
+    RESTRICTED = "restricted"
+    EMPTY = "empty"
+
+
+class ShortLinkBatchResultDTO(BaseModel):
+    status: ShortLinkBatchStatus
+    link: LinkDTO | None = None
+
+
+class LinkEvent(BaseModel):
+    action: Literal["created", "activated", "deactivated"]
+    short_url: str
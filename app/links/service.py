@@ -1,15 +1,65 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database.mixins import universal_time
+
+from .cache import (
+    LinkCache,
+    ShortURLFilter,
+    link_cache,
+    link_filter,
+)
+from .counters import (
+    ClickCounterBuffer,
+    link_click_counter,
+)
 from .repositories import LinkRepository
+from .rollups import (
+    ClickRollupBuffer,
+    link_click_rollups,
+)
+from .visitors import (
+    VisitorSketchBuffer,
+    link_visitors,
+)
+from .trends import (
+    LinkTrends,
+    TrendWindow,
+    link_trends,
+)
+from .settings import link_settings
 from .schemas import (
     ShortLinkCreateDTO,
+    ShortLinkBatchResultDTO,
+    ShortLinkBatchStatus,
     LinkDTO,
+    LinkEvent,
+    LinkVisitorsDTO,
+    LinkPageDTO,
+    LinkStatsDTO,
+    TrendingLinkDTO,
+    ClickPointDTO,
+    ClickSeriesDTO,
+)
+from .utils import (
+    GRANULARITY_STEPS,
+    Granularity,
+    base62_encode_many,
+    decode_cursor,
+    encode_cursor,
+    to_naive_utc,
+    truncate_time,
 )
-from .utils import base62_encode
 from .exceptions import (
     URLRestricted,
     URLNotFoundError,
     URLCannotBeEmpty,
+    InvalidCursor,
+    RollupRangeTooLarge,
 )
 
 
@@ -18,6 +68,12 @@ class LinkService:
         self,
         session: AsyncSession | None = None,
         repository: LinkRepository | None = None,
+        cache: LinkCache | None = None,
+        click_counter: ClickCounterBuffer | None = None,
+        short_url_filter: ShortURLFilter | None = None,
+        trends: LinkTrends | None = None,
+        rollups: ClickRollupBuffer | None = None,
+        visitors: VisitorSketchBuffer | None = None,
     ):
         if repository:
             self.repository = repository
@@ -25,6 +81,12 @@ class LinkService:
             self.repository = LinkRepository(session)
         else:
             raise ValueError("A session or repository is required. None of them are defined.")
+        self.cache = link_cache if cache is None else cache
+        self.click_counter = link_click_counter if click_counter is None else click_counter
+        self.short_url_filter = link_filter if short_url_filter is None else short_url_filter
+        self.trends = link_trends if trends is None else trends
+        self.rollups = link_click_rollups if rollups is None else rollups
+        self.visitors = link_visitors if visitors is None else visitors
 
     @classmethod
     def _normalize_url(cls, url: str) -> str:
@@ -32,39 +94,180 @@ class LinkService:
             url = f"http://{url}"
         return url
 
+    async def _publish_event(self, event: LinkEvent, *, commit: bool = False) -> None:
+        if link_settings.events_enabled:
+            await self.repository.publish(link_settings.events_channel, event.model_dump_json(), commit=commit)
+
     async def shorten_url(self, link: ShortLinkCreateDTO) -> LinkDTO:
         if not link.full_url:
             raise URLCannotBeEmpty()
         url = self._normalize_url(link.full_url)
-        if old_link := await self.repository.get_by_full_url(url):
-            if not old_link.is_active:
-                raise URLRestricted()
-            return old_link
-        else:
-            return await self.repository.flush_create(full_url=url, short_url=base62_encode)
+        link, created = await self.repository.get_or_create(full_url=url, short_url=base62_encode_many)
+        if not link.is_active:
+            raise URLRestricted()
+        if created:
+            self.short_url_filter.add(link.short_url)
+            await self._publish_event(LinkEvent(action="created", short_url=link.short_url), commit=True)
+        return link
 
-    async def get_link(self, short_url: str) -> LinkDTO | None:
-        if link := await self.repository.get_by_short_url(short_url):
-            if not link.is_active:
-                raise URLRestricted()
-            link = await self.repository.update_by_full_url(
-                full_url=link.full_url,
-                count_requests=link.count_requests + 1,
+    async def shorten_urls(self, links: list[ShortLinkCreateDTO]) -> list[ShortLinkBatchResultDTO]:
+        urls = [self._normalize_url(link.full_url) if link.full_url else None for link in links]
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        existing = await self.repository.get_by_full_urls(unique_urls, link_settings.batch_chunk_size)
+        missing_urls = [url for url in unique_urls if url not in existing]
+        created = {
+            link.full_url: link
+            for link in await self.repository.bulk_create(
+                [{"full_url": url, "short_url": base62_encode_many} for url in missing_urls],
+                link_settings.batch_chunk_size,
             )
+        }
+        if conflicting_urls := [url for url in missing_urls if url not in created]:
+            existing.update(await self.repository.get_by_full_urls(conflicting_urls, link_settings.batch_chunk_size))
+        for link in created.values():
+            self.short_url_filter.add(link.short_url)
+        if link_settings.events_enabled and created:
+            events = [LinkEvent(action="created", short_url=link.short_url).model_dump_json() for link in created.values()]
+            for start in range(0, len(events), link_settings.batch_chunk_size):
+                await self.repository.publish_many(
+                    link_settings.events_channel,
+                    events[start:start + link_settings.batch_chunk_size],
+                    commit=start + link_settings.batch_chunk_size >= len(events),
+                )
+
+        results = []
+        for url in urls:
+            if url is None:
+                results.append(ShortLinkBatchResultDTO(status=ShortLinkBatchStatus.EMPTY))
+            elif link := created.pop(url, None):
+                existing[url] = link
+                results.append(ShortLinkBatchResultDTO(status=ShortLinkBatchStatus.CREATED, link=link))
+            elif not existing[url].is_active:
+                results.append(ShortLinkBatchResultDTO(status=ShortLinkBatchStatus.RESTRICTED))
+            else:
+                results.append(ShortLinkBatchResultDTO(status=ShortLinkBatchStatus.EXISTING, link=existing[url]))
+        return results
+
+    async def _resolve_link(self, short_url: str) -> LinkDTO | None:
+        if link := self.cache.get(short_url):
+            return link
+        if link := await self.repository.get_by_short_url(short_url, self.cache.pop_invalidated(short_url)):
+            self.cache.set(link)
+        return link
+
+    def _record_click(self, link: LinkDTO, visitor: str | None = None) -> None:
+        if link_settings.click_counting == "buffered":
+            self.click_counter.add(link.id)
+        if link_settings.trends_enabled:
+            self.trends.add(link.short_url)
+        if link_settings.rollups_enabled:
+            self.rollups.add(link.id)
+        if link_settings.visitors_enabled and visitor:
+            self.visitors.add(link.id, visitor)
+
+    async def get_link(self, short_url: str, visitor: str | None = None) -> LinkDTO | None:
+        if not self.short_url_filter.might_exist(short_url):
+            raise URLNotFoundError()
+        if link_settings.click_counting == "buffered":
+            if link := await self._resolve_link(short_url):
+                if not link.is_active:
+                    raise URLRestricted()
+                self._record_click(link, visitor)
+                return link
+            raise URLNotFoundError()
+        if link := await self.repository.count_request_by_short_url(short_url):
+            self._record_click(link, visitor)
             return link
+        self.cache.invalidate(short_url)
+        if await self._resolve_link(short_url):
+            raise URLRestricted()
         raise URLNotFoundError()
 
+    async def peek_link(self, short_url: str) -> LinkDTO:
+        if not self.short_url_filter.might_exist(short_url):
+            raise URLNotFoundError()
+        link = await self._resolve_link(short_url)
+        if link is None:
+            raise URLNotFoundError()
+        if not link.is_active:
+            raise URLRestricted()
+        return link
+
     async def deactivate_link(self, short_url: str) -> LinkDTO | None:
         if link := await self.repository.get_by_short_url(short_url):
-            return await self.repository.update(link.id, is_active=False)
+            await self._publish_event(LinkEvent(action="deactivated", short_url=short_url))
+            link = await self.repository.set_active(link.id, False)
+            self.cache.invalidate(short_url)
+            return link
         raise URLNotFoundError()
 
     async def activate_link(self, short_url: str) -> LinkDTO | None:
         if link := await self.repository.get_by_short_url(short_url):
-            return await self.repository.update(link.id, is_active=True)
+            await self._publish_event(LinkEvent(action="activated", short_url=short_url))
+            link = await self.repository.set_active(link.id, True)
+            self.cache.invalidate(short_url)
+            return link
         raise URLNotFoundError()
 
-    async def get_links(self, is_active: bool | None = None) -> list[LinkDTO]:
-        if is_active is not None:
-            return await self.repository.get_all(is_active=is_active)
-        return await self.repository.get_all()
+    async def get_links(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        is_active: bool | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        estimate_total: bool = False,
+    ) -> LinkPageDTO:
+        try:
+            after_id = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise InvalidCursor() from None
+        filters = {
+            "is_active": is_active,
+            "created_from": to_naive_utc(created_from),
+            "created_to": to_naive_utc(created_to),
+        }
+        links = await self.repository.get_page(limit + 1, after_id, **filters)
+        page = LinkPageDTO(items=links[:limit])
+        if len(links) > limit:
+            page.next_cursor = encode_cursor(links[limit - 1].id)
+        if estimate_total:
+            page.total_estimate = await self.repository.estimate_count(**filters)
+        return page
+
+    async def get_stats(self, days: int) -> LinkStatsDTO:
+        return await self.repository.get_stats(universal_time().date() - timedelta(days=days - 1))
+
+    async def get_trending(self, window: TrendWindow, limit: int) -> list[TrendingLinkDTO]:
+        return await self.trends.top(window, limit)
+
+    async def get_click_series(
+        self,
+        short_url: str,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> ClickSeriesDTO:
+        step = GRANULARITY_STEPS[granularity]
+        end = truncate_time(to_naive_utc(end) or universal_time(), granularity) + step
+        start = truncate_time(to_naive_utc(start) or end - step * 60, granularity)
+        if start >= end or (end - start) / step > link_settings.rollups_max_points:
+            raise RollupRangeTooLarge()
+        link = await self.repository.get_by_short_url(short_url)
+        if link is None:
+            raise URLNotFoundError()
+        clicks = dict(await self.repository.get_click_rollups(link.id, granularity, start, end))
+        points = []
+        while start < end:
+            points.append(ClickPointDTO(bucket_start=start, clicks=clicks.get(start, 0)))
+            start += step
+        return ClickSeriesDTO(short_url=short_url, granularity=granularity, points=points)
+
+    async def get_unique_visitors(self, short_url: str) -> LinkVisitorsDTO:
+        link = await self.repository.get_by_short_url(short_url)
+        if link is None:
+            raise URLNotFoundError()
+        sketch = await self.repository.get_visitor_sketch(link.id)
+        if (pending := self.visitors.pending(link.id)) is not None:
+            sketch = pending if sketch is None else sketch.merge(pending)
+        return LinkVisitorsDTO(**dict(link), unique_visitors=0 if sketch is None else len(sketch))
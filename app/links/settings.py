@@ -0,0 +1,81 @@
+from typing import (
+    Annotated,
+    Literal,
+    Self,
+)
+
+from pydantic import (
+    Field,
+    model_validator,
+)
+from pydantic_settings import (
+    BaseSettings,
+    SettingsConfigDict,
+)
+
+
+class LinkSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        extra="ignore",
+    )
+
+    cache_size: Annotated[int, Field(alias="LINKS_CACHE_SIZE", ge=0)] = 100_000
+    cache_ttl: Annotated[float, Field(alias="LINKS_CACHE_TTL", gt=0)] = 60.0
+    cache_preload: Annotated[int, Field(alias="LINKS_CACHE_PRELOAD", ge=0)] = 0
+    cache_preload_window: Annotated[float, Field(alias="LINKS_CACHE_PRELOAD_WINDOW", gt=0)] = 3600.0
+    id_block_size: Annotated[int, Field(alias="LINKS_ID_BLOCK_SIZE", ge=0)] = 0
+    resolve_by_id: Annotated[bool, Field(alias="LINKS_RESOLVE_BY_ID")] = False
+    repository: Annotated[Literal["orm", "core"], Field(alias="LINKS_REPOSITORY")] = "orm"
+    batch_max_size: Annotated[int, Field(alias="LINKS_BATCH_MAX_SIZE", gt=0)] = 50_000
+    batch_chunk_size: Annotated[int, Field(alias="LINKS_BATCH_CHUNK_SIZE", gt=0)] = 1000
+    filter_enabled: Annotated[bool, Field(alias="LINKS_FILTER_ENABLED")] = False
+    filter_capacity: Annotated[int, Field(alias="LINKS_FILTER_CAPACITY", gt=0)] = 10_000_000
+    filter_error_rate: Annotated[float, Field(alias="LINKS_FILTER_ERROR_RATE", gt=0, lt=1)] = 0.001
+    events_enabled: Annotated[bool, Field(alias="LINKS_EVENTS_ENABLED")] = False
+    events_channel: Annotated[str, Field(alias="LINKS_EVENTS_CHANNEL")] = "links_events"
+    fast_path_enabled: Annotated[bool, Field(alias="LINKS_FAST_PATH_ENABLED")] = False
+    click_counting: Annotated[Literal["sync", "buffered"], Field(alias="LINKS_CLICK_COUNTING")] = "sync"
+    click_flush_interval: Annotated[float, Field(alias="LINKS_CLICK_FLUSH_INTERVAL", gt=0)] = 1.0
+    click_flush_threshold: Annotated[int, Field(alias="LINKS_CLICK_FLUSH_THRESHOLD", gt=0)] = 1000
+    page_default_size: Annotated[int, Field(alias="LINKS_PAGE_DEFAULT_SIZE", gt=0)] = 100
+    page_max_size: Annotated[int, Field(alias="LINKS_PAGE_MAX_SIZE", gt=0)] = 1000
+    export_chunk_size: Annotated[int, Field(alias="LINKS_EXPORT_CHUNK_SIZE", gt=0)] = 10_000
+    export_max_chunk_size: Annotated[int, Field(alias="LINKS_EXPORT_MAX_CHUNK_SIZE", gt=0)] = 100_000
+    stats_enabled: Annotated[bool, Field(alias="LINKS_STATS_ENABLED")] = True
+    stats_slots: Annotated[int, Field(alias="LINKS_STATS_SLOTS", gt=0)] = 16
+    stats_reconcile_interval: Annotated[float, Field(alias="LINKS_STATS_RECONCILE_INTERVAL", ge=0)] = 0.0
+    trends_enabled: Annotated[bool, Field(alias="LINKS_TRENDS_ENABLED")] = True
+    trends_capacity: Annotated[int, Field(alias="LINKS_TRENDS_CAPACITY", gt=0)] = 1000
+    trends_share_interval: Annotated[float, Field(alias="LINKS_TRENDS_SHARE_INTERVAL", ge=0)] = 0.0
+    click_log_enabled: Annotated[bool, Field(alias="LINKS_CLICK_LOG_ENABLED")] = False
+    click_log_queue_size: Annotated[int, Field(alias="LINKS_CLICK_LOG_QUEUE_SIZE", gt=0)] = 100_000
+    click_log_batch_size: Annotated[int, Field(alias="LINKS_CLICK_LOG_BATCH_SIZE", gt=0)] = 5000
+    click_log_flush_interval: Annotated[float, Field(alias="LINKS_CLICK_LOG_FLUSH_INTERVAL", gt=0)] = 1.0
+    click_log_overflow: Annotated[Literal["drop", "block"], Field(alias="LINKS_CLICK_LOG_OVERFLOW")] = "drop"
+    click_log_ip_salt: Annotated[str | None, Field(alias="LINKS_CLICK_LOG_IP_SALT", max_length=64)] = None
+    click_log_partitions_ahead: Annotated[int, Field(alias="LINKS_CLICK_LOG_PARTITIONS_AHEAD", ge=1)] = 7
+    click_log_retention_days: Annotated[int, Field(alias="LINKS_CLICK_LOG_RETENTION_DAYS", ge=0)] = 0
+    rollups_enabled: Annotated[bool, Field(alias="LINKS_ROLLUPS_ENABLED")] = False
+    rollups_flush_interval: Annotated[float, Field(alias="LINKS_ROLLUPS_FLUSH_INTERVAL", gt=0)] = 5.0
+    rollups_max_points: Annotated[int, Field(alias="LINKS_ROLLUPS_MAX_POINTS", gt=0)] = 1500
+    rollups_minute_retention: Annotated[float, Field(alias="LINKS_ROLLUPS_MINUTE_RETENTION", gt=0)] = 2 * 86400.0
+    rollups_hour_retention: Annotated[float, Field(alias="LINKS_ROLLUPS_HOUR_RETENTION", gt=0)] = 90 * 86400.0
+    visitors_enabled: Annotated[bool, Field(alias="LINKS_VISITORS_ENABLED")] = False
+    visitors_precision: Annotated[int, Field(alias="LINKS_VISITORS_PRECISION", ge=4, le=14)] = 12
+    visitors_flush_interval: Annotated[float, Field(alias="LINKS_VISITORS_FLUSH_INTERVAL", gt=0)] = 30.0
+    visitors_flush_threshold: Annotated[int, Field(alias="LINKS_VISITORS_FLUSH_THRESHOLD", gt=0)] = 1000
+
+    @model_validator(mode="after")
+    def check_click_log_ip_salt(self) -> Self:
+        if self.click_log_enabled and len(self.click_log_ip_salt or "") < 16:
+            raise ValueError("LINKS_CLICK_LOG_ENABLED requires a LINKS_CLICK_LOG_IP_SALT of at least 16 characters")
+        return self
+
+    @model_validator(mode="after")
+    def check_filter_events(self) -> Self:
+        if self.filter_enabled and not self.events_enabled:
+            raise ValueError("LINKS_FILTER_ENABLED requires LINKS_EVENTS_ENABLED to share created links between workers")
+        return self
+
+
+link_settings = LinkSettings()
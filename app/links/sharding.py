@@ -0,0 +1,272 @@
+import asyncio
+import heapq
+from collections import defaultdict
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+)
+from datetime import (
+    date,
+    datetime,
+)
+from operator import itemgetter
+from typing import Any
+
+from app.core.database.connection import shard_session_factories
+from app.core.database.sequences import (
+    SequenceBlockAllocator,
+    configure_interleaved_sequence,
+)
+from app.core.database.sharding import ShardSessions
+from app.core.metrics import metrics_registry
+from app.core.sketches import HyperLogLog
+from app.core.tasks import PartialFlushError
+from .repositories import (
+    LinkRepository,
+    link_id_allocator,
+    link_repository_types,
+)
+from .schemas import (
+    LinkDailyStatsDTO,
+    LinkDTO,
+    LinkStatsDTO,
+)
+from .settings import link_settings
+from .utils import (
+    Granularity,
+    base62_decode,
+    url_hash,
+)
+
+
+SHARD_COUNT = len(shard_session_factories)
+
+shard_id_allocators: list[SequenceBlockAllocator | None] = [link_id_allocator]
+if link_id_allocator is not None:
+    shard_id_allocators.extend(
+        SequenceBlockAllocator("links_id_seq", link_settings.id_block_size) for _ in range(1, SHARD_COUNT)
+    )
+    for shard, allocator in enumerate(shard_id_allocators[1:], 1):
+        metrics_registry.register(f"links_ids_shard{shard}", allocator.stats)
+else:
+    shard_id_allocators.extend(None for _ in range(1, SHARD_COUNT))
+
+
+def shard_for_id(id_: int) -> int:
+    return id_ % SHARD_COUNT
+
+
+def shard_for_full_url(full_url: str) -> int:
+    return int.from_bytes(url_hash(full_url)[:8]) % SHARD_COUNT
+
+
+def shard_for_short_url(short_url: str) -> int | None:
+    try:
+        return shard_for_id(base62_decode(short_url))
+    except ValueError:
+        return None
+
+
+def merge_link_stats(stats: list[LinkStatsDTO]) -> LinkStatsDTO:
+    created_per_day = defaultdict(int)
+    for item in stats:
+        for day in item.created_per_day:
+            created_per_day[day.day] += day.created_links
+    return LinkStatsDTO(
+        total_links=sum(item.total_links for item in stats),
+        active_links=sum(item.active_links for item in stats),
+        inactive_links=sum(item.inactive_links for item in stats),
+        total_clicks=sum(item.total_clicks for item in stats),
+        created_per_day=[
+            LinkDailyStatsDTO(day=day, created_links=created_links)
+            for day, created_links in sorted(created_per_day.items())
+        ],
+    )
+
+
+async def configure_link_shards() -> None:
+    if SHARD_COUNT == 1:
+        return
+    for shard, session_factory in enumerate(shard_session_factories):
+        async with session_factory() as session:
+            await configure_interleaved_sequence(session, "links_id_seq", shard, SHARD_COUNT)
+
+
+class ShardedLinkRepository:
+    def __init__(self, sessions: ShardSessions, repository_type: type[LinkRepository] | None = None):
+        self.sessions = sessions
+        self.repository_type = link_repository_types[link_settings.repository] if repository_type is None else repository_type
+        self._repositories: dict[int, LinkRepository] = {}
+        self._pending_notifications = False
+
+    def shard(self, shard: int) -> LinkRepository:
+        if shard not in self._repositories:
+            self._repositories[shard] = self.repository_type(
+                self.sessions[shard],
+                shard_id_allocators[shard],
+                self.sessions.replica(shard),
+            )
+        return self._repositories[shard]
+
+    @classmethod
+    def _group_by_full_url(cls, items: list[Any], full_url: Callable[[Any], str]) -> dict[int, list[Any]]:
+        groups = defaultdict(list)
+        for item in items:
+            groups[shard_for_full_url(full_url(item))].append(item)
+        return groups
+
+    async def create(self, **data: Any) -> LinkDTO:
+        return await self.shard(shard_for_full_url(data["full_url"])).create(**data)
+
+    async def get_or_create(self, **data: Any) -> tuple[LinkDTO, bool]:
+        return await self.shard(shard_for_full_url(data["full_url"])).get_or_create(**data)
+
+    async def bulk_create(self, data: list[dict[str, Any]], chunk_size: int = 1000) -> list[LinkDTO]:
+        groups = self._group_by_full_url(data, lambda item: item["full_url"])
+        results = await asyncio.gather(
+            *(self.shard(shard).bulk_create(items, chunk_size) for shard, items in groups.items())
+        )
+        return [link for links in results for link in links]
+
+    async def get(self, id_: int) -> LinkDTO | None:
+        return await self.shard(shard_for_id(id_)).get(id_)
+
+    async def get_all(self, **data: Any) -> list[LinkDTO]:
+        results = await asyncio.gather(*(self.shard(shard).get_all(**data) for shard in range(SHARD_COUNT)))
+        return sorted((link for links in results for link in links), key=lambda link: link.id)
+
+    async def get_page(self, limit: int, after_id: int | None = None, **filters: Any) -> list[LinkDTO]:
+        results = await asyncio.gather(
+            *(self.shard(shard).get_page(limit, after_id, **filters) for shard in range(SHARD_COUNT))
+        )
+        return heapq.nsmallest(limit, (link for links in results for link in links), key=lambda link: link.id)
+
+    async def estimate_count(self, **filters: Any) -> int:
+        return sum(await asyncio.gather(*(self.shard(shard).estimate_count(**filters) for shard in range(SHARD_COUNT))))
+
+    async def _commit_notifications(self, shard: int) -> None:
+        if self._pending_notifications and shard != 0:
+            await self.sessions[0].commit()
+        self._pending_notifications = False
+
+    async def update(self, id_: int, **data: Any) -> LinkDTO | None:
+        link = await self.shard(shard := shard_for_id(id_)).update(id_, **data)
+        await self._commit_notifications(shard)
+        return link
+
+    async def set_active(self, id_: int, is_active: bool) -> LinkDTO | None:
+        link = await self.shard(shard := shard_for_id(id_)).set_active(id_, is_active)
+        await self._commit_notifications(shard)
+        return link
+
+    async def get_stats(self, since: date) -> LinkStatsDTO:
+        return merge_link_stats(
+            await asyncio.gather(*(self.shard(shard).get_stats(since) for shard in range(SHARD_COUNT)))
+        )
+
+    async def delete(self, id_: int) -> LinkDTO | None:
+        link = await self.shard(shard := shard_for_id(id_)).delete(id_)
+        await self._commit_notifications(shard)
+        return link
+
+    async def publish(self, channel: str, payload: str, *, commit: bool = False) -> None:
+        await self.shard(0).publish(channel, payload, commit=commit)
+        self._pending_notifications = not commit
+
+    async def publish_many(self, channel: str, payloads: list[str], *, commit: bool = False) -> None:
+        await self.shard(0).publish_many(channel, payloads, commit=commit)
+        self._pending_notifications = not commit
+
+    async def get_by_full_urls(self, full_urls: list[str], chunk_size: int = 1000) -> dict[str, LinkDTO]:
+        groups = self._group_by_full_url(full_urls, lambda url: url)
+        results = await asyncio.gather(
+            *(self.shard(shard).get_by_full_urls(urls, chunk_size) for shard, urls in groups.items())
+        )
+        return {url: link for links in results for url, link in links.items()}
+
+    async def get_by_full_url(self, full_url: str) -> LinkDTO | None:
+        return await self.shard(shard_for_full_url(full_url)).get_by_full_url(full_url)
+
+    async def get_by_short_url(self, short_url: str, primary: bool = False) -> LinkDTO | None:
+        if (shard := shard_for_short_url(short_url)) is None:
+            return None
+        return await self.shard(shard).get_by_short_url(short_url, primary)
+
+    async def count_request_by_short_url(self, short_url: str) -> LinkDTO | None:
+        if (shard := shard_for_short_url(short_url)) is None:
+            return None
+        return await self.shard(shard).count_request_by_short_url(short_url)
+
+    async def stream_links(self, chunk_size: int = 10_000, **filters: Any) -> AsyncIterator[list[LinkDTO]]:
+        for shard in range(SHARD_COUNT):
+            async for links in self.shard(shard).stream_links(chunk_size, **filters):
+                yield links
+
+    async def iter_short_urls(self, chunk_size: int = 10_000) -> AsyncIterator[str]:
+        for shard in range(SHARD_COUNT):
+            async for short_url in self.shard(shard).iter_short_urls(chunk_size):
+                yield short_url
+
+    @classmethod
+    def _group_by_id(cls, values: dict[Any, Any], link_id: Callable[[Any], int] = int) -> dict[int, dict[Any, Any]]:
+        groups = defaultdict(dict)
+        for key, value in values.items():
+            groups[shard_for_id(link_id(key))][key] = value
+        return groups
+
+    async def _flush_by_id(
+        self,
+        flush: Callable[[LinkRepository, dict[Any, Any]], Awaitable[None]],
+        values: dict[Any, Any],
+        link_id: Callable[[Any], int] = int,
+    ) -> None:
+        groups = self._group_by_id(values, link_id)
+        results = await asyncio.gather(
+            *(flush(self.shard(shard), items) for shard, items in groups.items()),
+            return_exceptions=True,
+        )
+        failed, errors = {}, []
+        for items, result in zip(groups.values(), results):
+            if isinstance(result, BaseException):
+                failed.update(items)
+                errors.append(result)
+        if errors:
+            raise PartialFlushError(failed, errors) from errors[0]
+
+    async def increment_many_count_requests(self, deltas: dict[int, int]) -> None:
+        await self._flush_by_id(lambda repository, items: repository.increment_many_count_requests(items), deltas)
+
+    async def add_click_rollups(self, deltas: dict[tuple[int, datetime], int]) -> None:
+        await self._flush_by_id(lambda repository, items: repository.add_click_rollups(items), deltas, itemgetter(0))
+
+    async def get_click_rollups(
+        self,
+        link_id: int,
+        granularity: Granularity,
+        start: datetime,
+        end: datetime,
+    ) -> list[tuple[datetime, int]]:
+        return await self.shard(shard_for_id(link_id)).get_click_rollups(link_id, granularity, start, end)
+
+    async def get_recently_clicked(self, limit: int, since: datetime) -> list[tuple[LinkDTO, int]]:
+        results = await asyncio.gather(
+            *(self.shard(shard).get_recently_clicked(limit, since) for shard in range(SHARD_COUNT))
+        )
+        return heapq.nlargest(limit, (item for items in results for item in items), key=lambda item: item[1])
+
+    async def merge_visitor_sketches(self, sketches: dict[int, HyperLogLog]) -> None:
+        await self._flush_by_id(lambda repository, items: repository.merge_visitor_sketches(items), sketches)
+
+    async def get_visitor_sketch(self, link_id: int) -> HyperLogLog | None:
+        return await self.shard(shard_for_id(link_id)).get_visitor_sketch(link_id)
+
+
+def get_link_repository(
+    sessions: ShardSessions,
+    repository_type: type[LinkRepository] | None = None,
+) -> LinkRepository | ShardedLinkRepository:
+    if SHARD_COUNT == 1:
+        repository_type = link_repository_types[link_settings.repository] if repository_type is None else repository_type
+        return repository_type(sessions[0], replica=sessions.replica(0))
+    return ShardedLinkRepository(sessions, repository_type)
@@ -0,0 +1,19 @@
+from app.core.database.connection import shard_session_factories
+from app.core.metrics import metrics_registry
+from app.core.tasks import PeriodicTask
+from .repositories import LinkStatsRepository
+from .settings import link_settings
+
+
+async def reconcile_link_stats() -> None:
+    for session_factory in shard_session_factories:
+        async with session_factory() as session:
+            await LinkStatsRepository(session).reconcile()
+
+
+link_stats_reconciler = PeriodicTask(
+    func=reconcile_link_stats,
+    interval=link_settings.stats_reconcile_interval or 3600.0,
+)
+
+metrics_registry.register("links_stats_reconcile", link_stats_reconciler.stats)
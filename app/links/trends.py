@@ -0,0 +1,96 @@
+import os
+import socket
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from typing import (
+    Any,
+    Literal,
+)
+
+from app.core.database.connection import async_session_factory
+from app.core.database.mixins import universal_time
+from app.core.metrics import metrics_registry
+from app.core.sketches import (
+    SlidingTopK,
+    SpaceSaving,
+)
+from app.core.tasks import PeriodicTask
+from .repositories import LinkTrendRepository
+from .schemas import TrendingLinkDTO
+from .settings import link_settings
+
+
+TrendWindow = Literal["1m", "1h", "24h"]
+
+TREND_WINDOWS: dict[str, tuple[float, int]] = {
+    "1m": (60, 12),
+    "1h": (3600, 60),
+    "24h": (86400, 24),
+}
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LinkTrends:
+    def __init__(
+        self,
+        capacity: int,
+        share_interval: float = 0.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.share_interval = share_interval
+        self.windows = {
+            name: SlidingTopK(window, buckets, capacity, timer) for name, (window, buckets) in TREND_WINDOWS.items()
+        }
+
+    def add(self, short_url: str) -> None:
+        for window in self.windows.values():
+            window.add(short_url)
+
+    async def _remote_summaries(self, window: TrendWindow) -> list[tuple[list[tuple[str, int, int]], int]]:
+        since = universal_time() - timedelta(seconds=3 * self.share_interval)
+        async with async_session_factory() as session:
+            return await LinkTrendRepository(session).get_recent(window, since, exclude_worker=WORKER_ID)
+
+    async def top(self, window: TrendWindow, limit: int) -> list[TrendingLinkDTO]:
+        summary = self.windows[window].summary()
+        if self.share_interval:
+            summary = SpaceSaving.merged(
+                self.capacity,
+                [(summary.items(), summary.min_count), *await self._remote_summaries(window)],
+            )
+        return [
+            TrendingLinkDTO(short_url=short_url, count=count, error=error)
+            for short_url, count, error in summary.top(limit)
+        ]
+
+    async def share(self) -> None:
+        summaries = {}
+        for name, window in self.windows.items():
+            summary = window.summary()
+            summaries[name] = (summary.items(), summary.min_count)
+        async with async_session_factory() as session:
+            await LinkTrendRepository(session).save(WORKER_ID, summaries)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            f"{name}_{key}": value
+            for name, window in self.windows.items()
+            for key, value in window.stats().items()
+        }
+
+
+link_trends = LinkTrends(
+    capacity=link_settings.trends_capacity,
+    share_interval=link_settings.trends_share_interval,
+)
+
+link_trends_publisher = PeriodicTask(
+    func=link_trends.share,
+    interval=link_settings.trends_share_interval or 1.0,
+)
+
+metrics_registry.register("links_trends", link_trends.stats)
+metrics_registry.register("links_trends_share", link_trends_publisher.stats)
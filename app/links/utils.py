@@ -1,9 +1,31 @@
+import base64
+import hashlib
 import string
-from typing import LiteralString
+from collections.abc import Iterable
+from datetime import (
+    datetime,
+    timedelta,
+    UTC,
+)
+from typing import (
+    Literal,
+    LiteralString,
+)
 
 
 BASE62: LiteralString = string.digits + string.ascii_letters
 BASE62_LEN: int = len(BASE62)
+BASE62_INDEX: dict[str, int] = {char: index for index, char in enumerate(BASE62)}
+BASE62_PAIRS: list[str] = [first + second for first in BASE62 for second in BASE62]
+BASE62_PAIRS_LEN: int = len(BASE62_PAIRS)
+
+Granularity = Literal["minute", "hour", "day"]
+
+GRANULARITY_STEPS: dict[str, timedelta] = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
 
 
 def base62_encode(num: int) -> str:
@@ -12,3 +34,68 @@ def base62_encode(num: int) -> str:
         num, rem = divmod(num, BASE62_LEN)
         result.append(BASE62[rem])
     return ''.join(reversed(result)).zfill(6)
+
+
+def base62_decode(code: str) -> int:
+    if not code:
+        raise ValueError("Cannot decode an empty base62 string.")
+    num = 0
+    try:
+        for char in code:
+            num = num * BASE62_LEN + BASE62_INDEX[char]
+    except KeyError as e:
+        raise ValueError(f"Invalid base62 character: {e.args[0]!r}") from None
+    return num
+
+
+def base62_encode_many(nums: Iterable[int]) -> list[str]:
+    result = []
+    for num in nums:
+        pairs = []
+        while num > 0:
+            num, rem = divmod(num, BASE62_PAIRS_LEN)
+            pairs.append(BASE62_PAIRS[rem])
+        result.append(''.join(reversed(pairs)).lstrip('0').zfill(6))
+    return result
+
+
+def base62_decode_many(codes: Iterable[str]) -> list[int | None]:
+    result = []
+    for code in codes:
+        try:
+            result.append(base62_decode(code))
+        except ValueError:
+            result.append(None)
+    return result
+
+
+def url_hash(url: str) -> bytes:
+    return hashlib.sha256(url.encode()).digest()
+
+
+def encode_cursor(id_: int) -> str:
+    return base64.urlsafe_b64encode(str(id_).encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        id_ = int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)), 10)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if id_ < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return id_
+
+
+def to_naive_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def truncate_time(value: datetime, granularity: Granularity) -> datetime:
+    if granularity == "minute":
+        return value.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
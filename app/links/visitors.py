@@ -0,0 +1,73 @@
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from typing import Any
+
+from app.core.database.sharding import ShardSessions
+from app.core.metrics import metrics_registry
+from app.core.sketches import HyperLogLog
+from app.core.tasks import FlushBuffer
+from .settings import link_settings
+from .sharding import get_link_repository
+
+
+def visitor_key(client_ip: str | None, user_agent: str | None = None) -> str | None:
+    if not client_ip:
+        return None
+    return f"{client_ip}\x00{user_agent or ''}"
+
+
+class VisitorSketchBuffer(FlushBuffer):
+    def __init__(
+        self,
+        precision: int,
+        flush: Callable[[dict[int, HyperLogLog]], Awaitable[None]],
+        flush_interval: float,
+        flush_threshold: int,
+    ):
+        super().__init__(flush, flush_interval, flush_threshold)
+        self.precision = precision
+        self.flushed_sketches = 0
+
+    def add(self, link_id: int, visitor: str) -> None:
+        if (sketch := self._pending.get(link_id)) is None:
+            sketch = self._pending[link_id] = HyperLogLog(self.precision)
+            self._check_threshold()
+        sketch.add(visitor)
+
+    def pending(self, link_id: int) -> HyperLogLog | None:
+        return self._pending.get(link_id)
+
+    def _restore(self, sketches: dict[int, HyperLogLog]) -> None:
+        for link_id, sketch in sketches.items():
+            pending = self._pending.get(link_id)
+            self._pending[link_id] = sketch if pending is None else pending.merge(sketch)
+
+    def _flushed(self, sketches: dict[int, HyperLogLog]) -> None:
+        self.flushed_sketches += len(sketches)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending_links": len(self._pending),
+            "pending_bytes": sum(sketch.size for sketch in self._pending.values()),
+            "precision": self.precision,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "flushed_sketches": self.flushed_sketches,
+        }
+
+
+async def flush_visitor_sketches(sketches: dict[int, HyperLogLog]) -> None:
+    async with ShardSessions() as sessions:
+        await get_link_repository(sessions).merge_visitor_sketches(sketches)
+
+
+link_visitors = VisitorSketchBuffer(
+    precision=link_settings.visitors_precision,
+    flush=flush_visitor_sketches,
+    flush_interval=link_settings.visitors_flush_interval,
+    flush_threshold=link_settings.visitors_flush_threshold,
+)
+
+metrics_registry.register("links_visitors", link_visitors.stats)
@@ -1,18 +1,124 @@
+import logging
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
+from app.core.database.connection import (
+    dispose_engines,
+    prewarm_engines,
+)
+from app.core.database.replicas import (
+    replica_health_checker,
+    shard_replica_pools,
+)
+from app.core.database.settings import database_settings
+from app.core.drain import (
+    DrainMiddleware,
+    drain_on_signal,
+    request_drain,
+)
 from app.core.exc_handlers import setup_exception_handlers
+from app.core.responses import PydanticJSONResponse
+from app.core.router import router as core_router
+from app.core.settings import app_settings
+from app.links.click_log import (
+    link_click_log,
+    link_click_log_partitions,
+)
+from app.links.counters import link_click_counter
+from app.links.events import (
+    link_events_listener,
+    load_link_filter,
+    preload_link_cache,
+)
+from app.links.fastpath import (
+    RedirectFastPathMiddleware,
+    redirect_headers,
+)
+from app.links.rollups import (
+    link_click_rollups,
+    link_rollups_retention,
+)
 from app.links.router import router as links_router
+from app.links.settings import link_settings
+from app.links.sharding import configure_link_shards
+from app.links.stats import link_stats_reconciler
+from app.links.trends import link_trends_publisher
+from app.links.visitors import link_visitors
+
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    request_drain.accept()
+    restore_signal_handler = drain_on_signal(request_drain)
+    await configure_link_shards()
+    if database_settings.pool_prewarm:
+        try:
+            await prewarm_engines(database_settings.pool_prewarm)
+        except Exception:
+            logger.exception("Failed to prewarm database connection pools")
+    if any(shard_replica_pools):
+        await replica_health_checker.run_once()
+        replica_health_checker.start()
+    if link_settings.events_enabled:
+        link_events_listener.start()
+    if link_settings.filter_enabled:
+        await load_link_filter()
+    preload_size = min(link_settings.cache_preload, link_settings.cache_size)
+    if preload_size and link_settings.click_counting == "buffered" and link_settings.rollups_enabled:
+        links = await preload_link_cache(preload_size, link_settings.cache_preload_window)
+        if link_settings.fast_path_enabled:
+            for link in links:
+                redirect_headers(link.full_url)
+    link_click_counter.start()
+    if link_settings.stats_enabled and link_settings.stats_reconcile_interval:
+        link_stats_reconciler.start()
+    if link_settings.trends_enabled and link_settings.trends_share_interval:
+        link_trends_publisher.start()
+    if link_settings.click_log_enabled:
+        await link_click_log_partitions.run_once()
+        link_click_log_partitions.start()
+        link_click_log.start()
+    if link_settings.rollups_enabled:
+        link_click_rollups.start()
+        link_rollups_retention.start()
+    if link_settings.visitors_enabled:
+        link_visitors.start()
+    yield
+    await request_drain.drain(app_settings.drain_timeout)
+    restore_signal_handler()
+    await link_visitors.stop()
+    await link_rollups_retention.stop()
+    await link_click_rollups.stop()
+    await link_click_log.stop()
+    await link_click_log_partitions.stop()
+    await link_trends_publisher.stop()
+    await link_stats_reconciler.stop()
+    await link_click_counter.stop()
+    await link_events_listener.stop()
+    await replica_health_checker.stop()
+    await dispose_engines()
 
 
 app = FastAPI(
     title='URL Shortener',
     version="0.1",
+    lifespan=lifespan,
+    default_response_class=PydanticJSONResponse,
 )
 
 setup_exception_handlers(app)
+app.include_router(core_router)
 app.include_router(links_router)
 
+if link_settings.fast_path_enabled:
+    app.add_middleware(RedirectFastPathMiddleware)
+app.add_middleware(DrainMiddleware, drain=request_drain)
+
 
 if __name__ == '__main__':
     uvicorn.run("main:app", host='localhost', port=8000, reload=True)
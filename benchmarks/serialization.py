@@ -0,0 +1,86 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.responses import (
+    JSONResponse,
+    Response,
+)
+from pydantic import TypeAdapter
+
+from app.core.exceptions import ApplicationError
+from app.core.responses import (
+    PydanticJSONResponse,
+    TypedJSONResponse,
+)
+from app.core.schemas import ErrorResponse
+from app.links.exceptions import URLNotFoundError
+from app.links.schemas import LinkDTO
+
+
+SIZES = (1, 100, 10_000)
+TARGET_ITEMS = 200_000
+
+links_adapter = TypeAdapter(list[LinkDTO])
+
+
+def make_links(count: int) -> list[LinkDTO]:
+    return [
+        LinkDTO(
+            id=i,
+            full_url=f"https://example.com/articles/{i}?utm_source=benchmark",
+            short_url=f"{i:06d}",
+            count_requests=i * 7,
+            is_active=i % 10 != 0,
+        )
+        for i in range(count)
+    ]
+
+
+def response_model_pipeline(links: list[LinkDTO]) -> JSONResponse:
+    return JSONResponse(links_adapter.dump_python(links_adapter.validate_python(links), mode="json"))
+
+
+def pydantic_json(links: list[LinkDTO]) -> PydanticJSONResponse:
+    return PydanticJSONResponse(links)
+
+
+def typed_json(links: list[LinkDTO]) -> TypedJSONResponse:
+    return TypedJSONResponse(links_adapter, links)
+
+
+def error_per_exception(ex: ApplicationError) -> JSONResponse:
+    return JSONResponse(ErrorResponse(msg=ex.message, code=ex.error_code).model_dump(mode="json"), ex.status_code)
+
+
+def error_prerendered(ex: ApplicationError) -> Response:
+    return Response(ex.body, ex.status_code, media_type="application/json")
+
+
+def measure(func: Callable[[Any], Any], payload: Any, iterations: int) -> float:
+    func(payload)
+    started = time.process_time()
+    for _ in range(iterations):
+        func(payload)
+    return (time.process_time() - started) / iterations
+
+
+def main() -> None:
+    print(f"{'payload':>10} {'variant':>24} {'cpu/response':>14} {'speedup':>8}")
+    for size in SIZES:
+        links = make_links(size)
+        iterations = max(TARGET_ITEMS // size, 5)
+        baseline = None
+        for func in (response_model_pipeline, pydantic_json, typed_json):
+            elapsed = measure(func, links, iterations)
+            baseline = baseline or elapsed
+            print(f"{size:>10} {func.__name__:>24} {elapsed * 1e6:>11.1f} us {baseline / elapsed:>7.1f}x")
+    baseline = None
+    for func in (error_per_exception, error_prerendered):
+        elapsed = measure(func, URLNotFoundError(), 100_000)
+        baseline = baseline or elapsed
+        print(f"{'error':>10} {func.__name__:>24} {elapsed * 1e6:>11.1f} us {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""add links pagination indexes
+
+Revision ID: 3f1c8a2d7b64
+Revises: 975502e9ce35
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c8a2d7b64"
+down_revision: Union[str, None] = "975502e9ce35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("links_is_active_id_idx", "links", ["is_active", "id"], postgresql_concurrently=True)
+        op.create_index("links_created_at_idx", "links", ["created_at"], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("links_created_at_idx", table_name="links", postgresql_concurrently=True)
+        op.drop_index("links_is_active_id_idx", table_name="links", postgresql_concurrently=True)
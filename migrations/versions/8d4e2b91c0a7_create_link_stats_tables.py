@@ -0,0 +1,50 @@
+"""create link stats tables
+
+Revision ID: 8d4e2b91c0a7
+Revises: 3f1c8a2d7b64
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4e2b91c0a7"
+down_revision: Union[str, None] = "3f1c8a2d7b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "link_stats",
+        sa.Column("slot", sa.SmallInteger(), nullable=False),
+        sa.Column("total_links", sa.BigInteger(), nullable=False),
+        sa.Column("active_links", sa.BigInteger(), nullable=False),
+        sa.Column("total_clicks", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("slot", name=op.f("link_stats_pkey")),
+    )
+    op.create_table(
+        "link_daily_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("slot", sa.SmallInteger(), nullable=False),
+        sa.Column("created_links", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "slot", name=op.f("link_daily_stats_pkey")),
+    )
+    op.execute(
+        "INSERT INTO link_stats (slot, total_links, active_links, total_clicks) "
+        "SELECT 0, count(*), count(*) FILTER (WHERE is_active), coalesce(sum(count_requests), 0) FROM links"
+    )
+    op.execute(
+        "INSERT INTO link_daily_stats (day, slot, created_links) "
+        "SELECT created_at::date, 0, count(*) FROM links GROUP BY 1"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("link_daily_stats")
+    op.drop_table("link_stats")
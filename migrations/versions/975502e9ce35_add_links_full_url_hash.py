@@ -0,0 +1,72 @@
+"""add links full_url_hash
+
+Revision ID: 975502e9ce35
+Revises: 904df92b74c4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "975502e9ce35"
+down_revision: Union[str, None] = "904df92b74c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def backfill_full_url_hash() -> None:
+    connection = op.get_bind()
+    while True:
+        result = connection.execute(
+            sa.text(
+                "UPDATE links SET full_url_hash = sha256(convert_to(full_url, 'UTF8')) "
+                "WHERE id IN (SELECT id FROM links WHERE full_url_hash IS NULL LIMIT :batch_size)"
+            ),
+            {"batch_size": BACKFILL_BATCH_SIZE},
+        )
+        if result.rowcount == 0:
+            break
+
+
+def upgrade() -> None:
+    op.add_column("links", sa.Column("full_url_hash", sa.LargeBinary(length=32), nullable=True))
+
+    # Backfill in committed batches so the table is never locked for the whole run.
+    # sha256(convert_to(...)) matches app.links.utils.url_hash.
+    with op.get_context().autocommit_block():
+        backfill_full_url_hash()
+        op.create_index(
+            "links_full_url_hash_key",
+            "links",
+            ["full_url_hash"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        # NOT VALID only guards new rows; rows written without a hash before it landed are
+        # backfilled again, then VALIDATE scans under SHARE UPDATE EXCLUSIVE instead of
+        # SET NOT NULL scanning under ACCESS EXCLUSIVE.
+        op.execute(
+            "ALTER TABLE links ADD CONSTRAINT links_full_url_hash_not_null "
+            "CHECK (full_url_hash IS NOT NULL) NOT VALID"
+        )
+        backfill_full_url_hash()
+        op.execute("ALTER TABLE links VALIDATE CONSTRAINT links_full_url_hash_not_null")
+
+    op.alter_column("links", "full_url_hash", nullable=False)
+    op.execute("ALTER TABLE links DROP CONSTRAINT links_full_url_hash_not_null")
+    op.execute("ALTER TABLE links ADD CONSTRAINT links_full_url_hash_key UNIQUE USING INDEX links_full_url_hash_key")
+    op.drop_constraint(op.f("links_full_url_key"), "links", type_="unique")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint(op.f("links_full_url_key"), "links", ["full_url"])
+    op.drop_constraint(op.f("links_full_url_hash_key"), "links", type_="unique")
+    op.drop_column("links", "full_url_hash")
@@ -0,0 +1,35 @@
+"""create link trend snapshots table
+
+Revision ID: b6a9f3e15d28
+Revises: 8d4e2b91c0a7
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6a9f3e15d28"
+down_revision: Union[str, None] = "8d4e2b91c0a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "link_trend_snapshots",
+        sa.Column("worker", sa.String(), nullable=False),
+        sa.Column("window", sa.String(), nullable=False),
+        sa.Column("min_count", sa.BigInteger(), nullable=False),
+        sa.Column("items", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("worker", "window", name=op.f("link_trend_snapshots_pkey")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("link_trend_snapshots")
@@ -0,0 +1,36 @@
+"""create click events table
+
+Revision ID: c27e5a8f4d13
+Revises: b6a9f3e15d28
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c27e5a8f4d13"
+down_revision: Union[str, None] = "b6a9f3e15d28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "click_events",
+        sa.Column("clicked_at", sa.DateTime(), nullable=False),
+        sa.Column("link_id", sa.BigInteger(), nullable=False),
+        sa.Column("referrer", sa.String(), nullable=True),
+        sa.Column("user_agent", sa.String(), nullable=True),
+        sa.Column("ip_hash", sa.LargeBinary(length=16), nullable=True),
+        postgresql_partition_by="RANGE (clicked_at)",
+    )
+    op.create_index("click_events_link_id_clicked_at_idx", "click_events", ["link_id", "clicked_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("click_events")
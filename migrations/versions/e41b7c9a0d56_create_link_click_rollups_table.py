@@ -0,0 +1,40 @@
+"""create link click rollups table
+
+Revision ID: e41b7c9a0d56
+Revises: c27e5a8f4d13
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e41b7c9a0d56"
+down_revision: Union[str, None] = "c27e5a8f4d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "link_click_rollups",
+        sa.Column("link_id", sa.BigInteger(), nullable=False),
+        sa.Column("granularity", sa.String(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("clicks", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("link_id", "granularity", "bucket_start", name=op.f("link_click_rollups_pkey")),
+    )
+    op.create_index(
+        "link_click_rollups_granularity_bucket_start_idx",
+        "link_click_rollups",
+        ["granularity", "bucket_start"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("link_click_rollups_granularity_bucket_start_idx", table_name="link_click_rollups")
+    op.drop_table("link_click_rollups")
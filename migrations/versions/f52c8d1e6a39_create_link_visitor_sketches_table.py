@@ -0,0 +1,33 @@
+"""create link visitor sketches table
+
+Revision ID: f52c8d1e6a39
+Revises: e41b7c9a0d56
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f52c8d1e6a39"
+down_revision: Union[str, None] = "e41b7c9a0d56"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "link_visitor_sketches",
+        sa.Column("link_id", sa.BigInteger(), nullable=False),
+        sa.Column("registers", sa.LargeBinary(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("link_id", name=op.f("link_visitor_sketches_pkey")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("link_visitor_sketches")
@@ -35,12 +35,14 @@ async def db_session() -> "AsyncSession":
 
 @pytest.fixture(scope="package", autouse=True)
 async def db_lifespan() -> None:
-    from app.core.database.connection import async_engine
+    from app.core.database.connection import shard_engines
     from app.core.database.models import BaseModel
     from app.links.models import LinkDAO
 
-    async with async_engine.begin() as conn:
-        await conn.run_sync(BaseModel.metadata.create_all)
+    for engine in shard_engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(BaseModel.metadata.create_all)
     yield
-    async with async_engine.begin() as conn:
-        await conn.run_sync(BaseModel.metadata.drop_all)
+    for engine in shard_engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(BaseModel.metadata.drop_all)
@@ -0,0 +1,92 @@
+import pytest
+from pydantic import ValidationError
+
+from app.links.cache import LinkCache
+from app.links.schemas import LinkDTO
+from app.links.settings import LinkSettings
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_link(short_url: str, is_active: bool = True) -> LinkDTO:
+    return LinkDTO(
+        id=1,
+        full_url=f"http://{short_url}",
+        short_url=short_url,
+        count_requests=0,
+        is_active=is_active,
+    )
+
+
+def test__cache__hit_and_miss():
+    cache = LinkCache(maxsize=10, ttl=60)
+    assert cache.get("000001") is None
+    cache.set(make_link("000001"))
+    assert cache.get("000001").full_url == "http://000001"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test__cache__lru_eviction():
+    cache = LinkCache(maxsize=2, ttl=60)
+    cache.set(make_link("000001"))
+    cache.set(make_link("000002"))
+    cache.get("000001")
+    cache.set(make_link("000003"))
+    assert "000001" in cache
+    assert "000002" not in cache
+    assert "000003" in cache
+    assert cache.evictions == 1
+
+
+def test__cache__ttl_expiration():
+    timer = FakeTimer()
+    cache = LinkCache(maxsize=10, ttl=5, timer=timer)
+    cache.set(make_link("000001"))
+    timer.now = 4.9
+    assert cache.get("000001") is not None
+    timer.now = 5.0
+    assert cache.get("000001") is None
+    assert len(cache) == 0
+
+
+def test__cache__invalidate():
+    cache = LinkCache(maxsize=10, ttl=60)
+    cache.set(make_link("000001"))
+    cache.invalidate("000001")
+    cache.invalidate("000002")
+    assert cache.get("000001") is None
+
+
+def test__cache__remembers_invalidations():
+    timer = FakeTimer()
+    cache = LinkCache(maxsize=1, ttl=60, timer=timer)
+    cache.set(make_link("000001"))
+    cache.invalidate("000001")
+    assert cache.get("000001") is None
+    assert cache.pop_invalidated("000001")
+    assert not cache.pop_invalidated("000001")
+
+    cache.invalidate("000001")
+    cache.invalidate("000002")
+    assert not cache.pop_invalidated("000001")
+    timer.now = 61
+    assert not cache.pop_invalidated("000002")
+
+
+def test__cache__disabled():
+    cache = LinkCache(maxsize=0, ttl=60)
+    cache.set(make_link("000001"))
+    assert len(cache) == 0
+
+
+def test__filter__requires_events():
+    with pytest.raises(ValidationError, match="LINKS_EVENTS_ENABLED"):
+        LinkSettings(LINKS_FILTER_ENABLED=True)
+    settings = LinkSettings(LINKS_FILTER_ENABLED=True, LINKS_EVENTS_ENABLED=True)
+    assert settings.filter_enabled and settings.events_enabled
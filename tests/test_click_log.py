@@ -0,0 +1,57 @@
+import pytest
+from pydantic import ValidationError
+
+from app.links.click_log import (
+    ClickEventLog,
+    click_record,
+)
+from app.links.settings import (
+    LinkSettings,
+    link_settings,
+)
+
+
+class FakeWrite:
+    def __init__(self):
+        self.batches: list[list[tuple]] = []
+
+    async def __call__(self, records: list[tuple]) -> None:
+        self.batches.append(records)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__click_event_log__drops_on_overflow():
+    write = FakeWrite()
+    log = ClickEventLog(write=write, max_queue_size=2, batch_size=10, flush_interval=60)
+    for link_id in range(3):
+        await log.record(click_record(link_id))
+    assert len(log) == 2
+    assert log.dropped == 1
+    await log.flush()
+    assert [[record[1] for record in batch] for batch in write.batches] == [[0, 1]]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__click_event_log__flushes_in_batches_on_stop(monkeypatch):
+    monkeypatch.setattr(link_settings, "click_log_ip_salt", "0123456789abcdef")
+    write = FakeWrite()
+    log = ClickEventLog(write=write, max_queue_size=100, batch_size=2, flush_interval=0.01)
+    log.start()
+    for link_id in range(5):
+        await log.record(click_record(link_id, referrer="r" * 2000, client_ip="127.0.0.1"))
+    await log.stop()
+    records = [record for batch in write.batches for record in batch]
+    assert [record[1] for record in records] == list(range(5))
+    assert all(len(batch) <= 2 for batch in write.batches)
+    assert len(records[0][2]) == 1024
+    assert len(records[0][4]) == 16
+    assert log.written == 5
+
+
+def test__link_settings__click_log_requires_ip_salt():
+    with pytest.raises(ValidationError, match="LINKS_CLICK_LOG_IP_SALT"):
+        LinkSettings(LINKS_CLICK_LOG_ENABLED=True)
+    with pytest.raises(ValidationError, match="LINKS_CLICK_LOG_IP_SALT"):
+        LinkSettings(LINKS_CLICK_LOG_ENABLED=True, LINKS_CLICK_LOG_IP_SALT="short")
+    settings = LinkSettings(LINKS_CLICK_LOG_ENABLED=True, LINKS_CLICK_LOG_IP_SALT="0123456789abcdef")
+    assert settings.click_log_ip_salt == "0123456789abcdef"
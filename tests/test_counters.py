@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest
+
+from app.links.counters import ClickCounterBuffer
+from app.links.rollups import ClickRollupBuffer
+from app.links.visitors import VisitorSketchBuffer
+
+
+class FakeFlush:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.batches: list[dict[int, int]] = []
+
+    async def __call__(self, deltas: dict[int, int]) -> None:
+        if self.fail:
+            raise RuntimeError("flush failed")
+        self.batches.append(deltas)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__click_counter__aggregates_increments():
+    flush = FakeFlush()
+    counter = ClickCounterBuffer(flush=flush, flush_interval=60, flush_threshold=100)
+    for link_id in (1, 2, 1, 1):
+        counter.add(link_id)
+    assert counter.pending(1) == 3
+    await counter.flush()
+    assert flush.batches == [{1: 3, 2: 1}]
+    assert len(counter) == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__click_counter__keeps_increments_on_failure():
+    flush = FakeFlush(fail=True)
+    counter = ClickCounterBuffer(flush=flush, flush_interval=60, flush_threshold=100)
+    counter.add(1, 2)
+    with pytest.raises(RuntimeError):
+        await counter.flush()
+    counter.add(1)
+    assert counter.pending(1) == 3
+    assert counter.failed_flushes == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__click_counter__drains_on_stop():
+    flush = FakeFlush()
+    counter = ClickCounterBuffer(flush=flush, flush_interval=60, flush_threshold=100)
+    counter.start()
+    counter.add(1)
+    await counter.stop()
+    assert flush.batches == [{1: 1}]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__click_rollups__bucket_by_click_minute():
+    flush = FakeFlush(fail=True)
+    rollups = ClickRollupBuffer(flush=flush, flush_interval=60, flush_threshold=100)
+    rollups.add_at(1, datetime(2026, 1, 1, 12, 0, 59))
+    with pytest.raises(RuntimeError):
+        await rollups.flush()
+    rollups.add_at(1, datetime(2026, 1, 1, 12, 1, 0), 2)
+    assert rollups.pending(1) == 3
+    flush.fail = False
+    await rollups.flush()
+    assert flush.batches == [{(1, datetime(2026, 1, 1, 12, 0)): 1, (1, datetime(2026, 1, 1, 12, 1)): 2}]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__visitor_sketches__merge_back_on_failure():
+    flush = FakeFlush(fail=True)
+    visitors = VisitorSketchBuffer(precision=8, flush=flush, flush_interval=60, flush_threshold=100)
+    visitors.add(1, "a")
+    visitors.add(1, "b")
+    with pytest.raises(RuntimeError):
+        await visitors.flush()
+    visitors.add(1, "c")
+    assert len(visitors.pending(1)) == 3
+    flush.fail = False
+    await visitors.stop()
+    assert list(flush.batches[0]) == [1]
+    assert visitors.stats()["flushed_sketches"] == 1
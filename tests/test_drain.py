@@ -0,0 +1,76 @@
+import asyncio
+import signal
+
+import pytest
+from fastapi import FastAPI
+from httpx import (
+    ASGITransport,
+    AsyncClient,
+)
+
+from app.core.drain import (
+    DrainMiddleware,
+    RequestDrain,
+    drain_on_signal,
+)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__request_drain__waits_for_in_flight():
+    drain = RequestDrain()
+    assert drain.enter()
+    waiter = asyncio.create_task(drain.drain(1.0))
+    await asyncio.sleep(0)
+    assert not drain.enter()
+    assert not waiter.done()
+    drain.exit()
+    assert await waiter
+    assert drain.stats() == {"in_flight": 0, "rejected": 1, "draining": True}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__request_drain__timeout():
+    drain = RequestDrain()
+    drain.enter()
+    assert not await drain.drain(0.01)
+    drain.accept()
+    assert drain.enter()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__drain_middleware():
+    drain = RequestDrain(retry_after=5)
+    app = FastAPI()
+    app.add_middleware(DrainMiddleware, drain=drain)
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"in_flight": drain.in_flight}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/ping")).json() == {"in_flight": 1}
+        assert await drain.drain(0.0)
+        response = await client.get("/ping")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    assert response.headers["connection"] == "close"
+    assert response.json()["code"] == "service_draining"
+
+
+def test__drain_on_signal__chains_previous_handler():
+    received = []
+    previous = signal.signal(signal.SIGUSR1, lambda signum, frame: received.append(signum))
+    try:
+        drain = RequestDrain()
+        restore = drain_on_signal(drain, signal.SIGUSR1)
+        signal.raise_signal(signal.SIGUSR1)
+        assert drain.draining
+        assert received == [signal.SIGUSR1]
+
+        drain.accept()
+        restore()
+        signal.raise_signal(signal.SIGUSR1)
+        assert not drain.draining
+        assert received == [signal.SIGUSR1, signal.SIGUSR1]
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
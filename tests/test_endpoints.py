@@ -74,6 +74,14 @@ async def test__open_link(async_http_client):
     assert response_redirect.url == "https://eritreandiaspora.org/"
 
 
+@pytest.mark.order(2)
+@pytest.mark.asyncio(loop_scope="session")
+async def test__head_link(async_http_client):
+    response = await async_http_client.head(url="/l/00000r/")
+    assert response.status_code == status.HTTP_308_PERMANENT_REDIRECT
+    assert response.headers["location"] == "http://eritreandiaspora.org/"
+
+
 @pytest.mark.order(5)
 @pytest.mark.asyncio(loop_scope="session")
 async def test__open_link__restricted_url(async_http_client):
@@ -81,12 +89,25 @@ async def test__open_link__restricted_url(async_http_client):
     assert_any_exception(URLRestricted, response)
 
 
+@pytest.mark.order(5)
+@pytest.mark.asyncio(loop_scope="session")
+async def test__head_link__restricted_url(async_http_client):
+    response = await async_http_client.head(url="/l/00000r/")
+    assert response.status_code == URLRestricted.status_code
+
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test__open_link__unknown_url(async_http_client):
     response = await async_http_client.get(url="/l/XXXXXX/")
     assert_any_exception(URLNotFoundError, response)
 
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test__head_link__unknown_url(async_http_client):
+    response = await async_http_client.head(url="/l/XXXXXX/")
+    assert response.status_code == URLNotFoundError.status_code
+
+
 @pytest.mark.order(6)
 @pytest.mark.asyncio(loop_scope="session")
 async def test__activate_link(async_http_client):
@@ -0,0 +1,50 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from app.links.export import (
+    encode_csv,
+    encode_ndjson,
+    gzip_stream,
+)
+from app.links.schemas import LinkDTO
+
+
+LINKS = [
+    LinkDTO(id=1, full_url="http://a.com", short_url="000001", count_requests=3, is_active=True),
+    LinkDTO(id=2, full_url="http://b.com/?q=1,2", short_url="000002", count_requests=0, is_active=False),
+]
+
+
+async def chunks():
+    yield LINKS[:1]
+    yield LINKS[1:]
+
+
+async def collect(data) -> bytes:
+    return b"".join([chunk async for chunk in data])
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__encode_ndjson():
+    lines = (await collect(encode_ndjson(chunks()))).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [link.model_dump() for link in LINKS]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__encode_csv():
+    rows = list(csv.reader(io.StringIO((await collect(encode_csv(chunks()))).decode())))
+    assert rows == [
+        ["full_url", "short_url", "count_requests", "is_active"],
+        ["http://a.com", "000001", "3", "True"],
+        ["http://b.com/?q=1,2", "000002", "0", "False"],
+    ]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__gzip_stream():
+    data = await collect(gzip_stream(encode_ndjson(chunks())))
+    assert gzip.decompress(data) == await collect(encode_ndjson(chunks()))
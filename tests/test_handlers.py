@@ -1,18 +1,31 @@
+import asyncio
 import random
 import string
+from datetime import (
+    datetime,
+    timedelta,
+)
 from typing import Literal
 
 import pytest
+from sqlalchemy import event
 
+from app.core.database.connection import async_engine
+from app.core.database.mixins import universal_time
 from app.links.service import LinkService
+from app.links.settings import link_settings
 from app.links.schemas import (
     ShortLinkCreateDTO,
+    ShortLinkBatchStatus,
     LinkDTO,
+    LinkEvent,
 )
 from app.links.exceptions import (
     URLNotFoundError,
     URLRestricted,
     URLCannotBeEmpty,
+    InvalidCursor,
+    RollupRangeTooLarge,
 )
 
 
@@ -125,12 +138,14 @@ class TestLinkService:
     ) -> LinkDTO:
         if not url:
             shorten_url_result = await self.shorten_url(protocol=protocol)
+            link_id = shorten_url_result.id
             full_url = shorten_url_result.full_url
             short_url = shorten_url_result.short_url
             count_requests = shorten_url_result.count_requests
             is_active = shorten_url_result.is_active
         else:
             link = await self.link_service.repository.get_by_full_url(full_url=url)
+            link_id = link.id
             full_url = link.full_url
             short_url = link.short_url
             count_requests = link.count_requests
@@ -145,12 +160,29 @@ class TestLinkService:
             )
             return get_link_result
         return LinkDTO(
+            id=link_id,
             full_url=full_url,
             short_url=short_url,
             count_requests=count_requests,
             is_active=is_active,
         )
 
+    async def test__get_link__buffered_cache_hit(self, monkeypatch):
+        monkeypatch.setattr(link_settings, "click_counting", "buffered")
+        link = await self.shorten_url()
+        self.link_service.cache.invalidate(link.short_url)
+        pending = self.link_service.click_counter.pending(link.id)
+        assert await self.link_service.get_link(link.short_url) == link
+
+        async def unreachable(short_url: str) -> None:
+            raise AssertionError("cache hit went to the database")
+
+        monkeypatch.setattr(self.link_service.repository, "get_by_short_url", unreachable)
+        monkeypatch.setattr(self.link_service.repository, "count_request_by_short_url", unreachable)
+        assert await self.link_service.get_link(link.short_url) == link
+        assert self.link_service.click_counter.pending(link.id) == pending + 2
+        self.link_service.cache.invalidate(link.short_url)
+
     async def test__normalize_url__with_protocol(self):
         http_url = generate_random_url(protocol="http")
         https_url = generate_random_url(protocol="https")
@@ -196,6 +228,55 @@ class TestLinkService:
             await self.link_service.shorten_url(ShortLinkCreateDTO(full_url=""))
         assert_any_exception(URLCannotBeEmpty, exc)
 
+    async def test__shorten_urls(self):
+        existing_link = await self.shorten_url(protocol="http")
+        restricted_link = await self.deactivate_link(protocol="http")
+        new_url = generate_random_url(protocol="https")
+        results = await self.link_service.shorten_urls(
+            [
+                ShortLinkCreateDTO(full_url=new_url),
+                ShortLinkCreateDTO(full_url=existing_link.full_url),
+                ShortLinkCreateDTO(full_url=""),
+                ShortLinkCreateDTO(full_url=restricted_link.full_url),
+                ShortLinkCreateDTO(full_url=new_url),
+            ]
+        )
+        assert [result.status for result in results] == [
+            ShortLinkBatchStatus.CREATED,
+            ShortLinkBatchStatus.EXISTING,
+            ShortLinkBatchStatus.EMPTY,
+            ShortLinkBatchStatus.RESTRICTED,
+            ShortLinkBatchStatus.EXISTING,
+        ]
+        assert_link_dto(dto=results[0].link, full_url=new_url)
+        assert_link_dto(dto=results[1].link, full_url=existing_link.full_url, short_url=existing_link.short_url)
+        assert results[4].link.short_url == results[0].link.short_url
+        assert await self.link_service.repository.get_by_full_url(full_url=new_url) == results[0].link
+
+    async def test__shorten_urls__publishes_events_per_chunk(self, monkeypatch):
+        monkeypatch.setattr(link_settings, "events_enabled", True)
+        monkeypatch.setattr(link_settings, "batch_chunk_size", 2)
+        statements = []
+
+        def record_statement(connection, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record_statement)
+        received = []
+        async with async_engine.connect() as connection:
+            driver_connection = (await connection.get_raw_connection()).driver_connection
+            await driver_connection.add_listener(
+                link_settings.events_channel,
+                lambda *args: received.append(LinkEvent.model_validate_json(args[-1])),
+            )
+            results = await self.link_service.shorten_urls(
+                [ShortLinkCreateDTO(full_url=generate_random_url(protocol="https")) for _ in range(5)]
+            )
+            await asyncio.sleep(0.1)
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record_statement)
+        assert [item.short_url for item in received] == [result.link.short_url for result in results]
+        assert sum("pg_notify" in statement for statement in statements) == 3
+
     async def test__get_link(self):
         await self.get_link(protocol="http")
 
@@ -244,3 +325,95 @@ class TestLinkService:
         with pytest.raises(URLNotFoundError) as exc:
             await self.link_service.activate_link("")
         assert_any_exception(URLNotFoundError, exc)
+
+    async def test__get_links__pagination(self):
+        for _ in range(3):
+            await self.shorten_url(protocol="https")
+        short_urls, cursor = [], None
+        while True:
+            page = await self.link_service.get_links(limit=2, cursor=cursor, is_active=True)
+            assert len(page.items) <= 2
+            short_urls.extend(link.short_url for link in page.items)
+            if not (cursor := page.next_cursor):
+                break
+        assert len(short_urls) == len(set(short_urls)) >= 3
+        assert all(link.is_active for link in (await self.link_service.get_links(limit=100, is_active=True)).items)
+
+    async def test__get_links__invalid_cursor(self):
+        with pytest.raises(InvalidCursor) as exc:
+            await self.link_service.get_links(limit=10, cursor="not a cursor")
+        assert_any_exception(InvalidCursor, exc)
+
+    async def test__get_stats(self):
+        before = await self.link_service.get_stats(days=1)
+        link = await self.get_link(protocol="https")
+        await self.link_service.deactivate_link(link.short_url)
+        after = await self.link_service.get_stats(days=1)
+        assert after.total_links == before.total_links + 1
+        assert after.active_links == before.active_links
+        assert after.inactive_links == before.inactive_links + 1
+        assert after.total_clicks == before.total_clicks + 1
+        assert sum(day.created_links for day in after.created_per_day) >= 1
+
+    async def test__get_click_series(self):
+        link = await self.shorten_url()
+        now = universal_time()
+        await self.link_service.repository.add_click_rollups(
+            {(link.id, now): 3, (link.id, now - timedelta(minutes=1)): 2}
+        )
+        series = await self.link_service.get_click_series(link.short_url, "hour")
+        assert series.granularity == "hour"
+        assert len(series.points) == 60
+        assert sum(point.clicks for point in series.points) == 5
+        series = await self.link_service.get_click_series(link.short_url, "minute")
+        assert [point.clicks for point in series.points[-2:]] == [2, 3]
+
+    async def test__get_click_series__range_too_large(self):
+        link = await self.shorten_url()
+        with pytest.raises(RollupRangeTooLarge) as excinfo:
+            await self.link_service.get_click_series(
+                link.short_url, "minute", datetime(2020, 1, 1), datetime(2021, 1, 1)
+            )
+        assert_any_exception(RollupRangeTooLarge, excinfo)
+
+    async def test__get_unique_visitors(self, monkeypatch):
+        monkeypatch.setattr(link_settings, "visitors_enabled", True)
+        link = await self.shorten_url()
+        for i in range(30):
+            await self.link_service.get_link(link.short_url, f"10.0.0.{i % 10}")
+        await self.link_service.repository.merge_visitor_sketches(self.link_service.visitors.drain())
+        result = await self.link_service.get_unique_visitors(link.short_url)
+        assert result.short_url == link.short_url
+        assert result.unique_visitors == 10
+
+    async def test__peek_link__refills_invalidated_link_from_primary(self, monkeypatch):
+        link = await self.shorten_url()
+        self.link_service.cache.invalidate(link.short_url)
+        repository = self.link_service.repository
+        get_by_short_url = repository.get_by_short_url
+        reads = []
+
+        async def record_read(short_url: str, primary: bool = False) -> LinkDTO | None:
+            reads.append(primary)
+            return await get_by_short_url(short_url, primary)
+
+        monkeypatch.setattr(repository, "get_by_short_url", record_read)
+        assert await self.link_service.peek_link(link.short_url) == link
+        self.link_service.cache.invalidate(link.short_url)
+        self.link_service.cache.pop_invalidated(link.short_url)
+        assert await self.link_service.peek_link(link.short_url) == link
+        assert reads == [True, False]
+
+    async def test__peek_link(self):
+        link = await self.shorten_url()
+        self.link_service.cache.invalidate(link.short_url)
+        assert await self.link_service.peek_link(link.short_url) == link
+        assert self.link_service.cache.get(link.short_url, count=False) == link
+        self.link_service.cache.set(link.model_copy(update={"is_active": False}))
+        with pytest.raises(URLRestricted) as excinfo:
+            await self.link_service.peek_link(link.short_url)
+        assert_any_exception(URLRestricted, excinfo)
+        self.link_service.cache.invalidate(link.short_url)
+        with pytest.raises(URLNotFoundError) as excinfo:
+            await self.link_service.peek_link("XXXXXX")
+        assert_any_exception(URLNotFoundError, excinfo)
@@ -0,0 +1,40 @@
+import pytest
+
+from app.core.database.connection import async_engine
+from app.core.database.pool import prewarm_pool
+from app.core.metrics import (
+    Histogram,
+    metrics_registry,
+)
+
+
+def test__histogram__render():
+    histogram = Histogram([0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.render("latency") == [
+        'latency_bucket{le="0.1"} 2.0',
+        'latency_bucket{le="1.0"} 3.0',
+        'latency_bucket{le="+Inf"} 4.0',
+        "latency_sum 2.65",
+        "latency_count 4.0",
+    ]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__pool_monitor__stats():
+    monitor = async_engine.pool.monitor
+    checkouts = monitor.checkout_seconds.count
+    async with async_engine.connect() as conn:
+        assert monitor.stats()["checked_out"] >= 1
+        await conn.exec_driver_sql("SELECT 1")
+    assert monitor.checkout_seconds.count == checkouts + 1
+    assert "database_pool_checkout_seconds_count" in metrics_registry.render()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__prewarm_pool():
+    await async_engine.dispose()
+    assert await prewarm_pool(async_engine, 100) == async_engine.pool.size()
+    assert async_engine.pool.checkedin() == async_engine.pool.size()
+    assert async_engine.pool.checkedout() == 0
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.database.replicas import (
+    ReplicaPool,
+    eject_replica,
+)
+from app.core.database.repositories import BaseAlchemyRepository
+
+
+def test__replica_pool__round_robin_and_ejection():
+    now = [0.0]
+    factories = [lambda: SimpleNamespace(info={}), lambda: SimpleNamespace(info={})]
+    pool = ReplicaPool(factories, eject_seconds=10, timer=lambda: now[0])
+    assert [pool.choose() for _ in range(4)] == [0, 1, 0, 1]
+
+    eject_replica(pool.session())
+    assert [pool.choose() for _ in range(3)] == [1, 1, 1]
+    assert pool.stats()["available"] == 1
+
+    eject_replica(pool.session())
+    assert pool.session() is None
+
+    now[0] = 10
+    assert {pool.choose(), pool.choose()} == {0, 1}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__read__falls_back_to_primary_unless_replica_is_fresh():
+    pool = ReplicaPool([lambda: SimpleNamespace(info={}, rows={})], max_lag=1.0)
+    primary = SimpleNamespace(info={}, rows={"000001": 1})
+    repository = BaseAlchemyRepository(primary, pool.session())
+
+    async def read(session):
+        return session.rows.get("000001")
+
+    assert await repository._read(read) == 1
+    pool.lags[0] = 0.5
+    assert await repository._read(read) is None
+    assert await repository._read(read, primary=True) == 1
+    pool.lags[0] = 2.0
+    assert await repository._read(read) == 1
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import (
+    func,
+    select,
+)
+
+from app.core.database.mixins import universal_time
+from app.core.database.sequences import SequenceBlockAllocator
+from app.links.models import (
+    LinkDAO,
+    LinkStatsDAO,
+)
+from app.links.repositories import (
+    CoreLinkRepository,
+    LinkRepository,
+    LinkStatsRepository,
+)
+from app.links.settings import link_settings
+from app.links.utils import base62_encode_many
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("resolve_by_id", [False, True])
+async def test__core_link_repository__matches_orm(db_session, monkeypatch, resolve_by_id):
+    monkeypatch.setattr(link_settings, "resolve_by_id", resolve_by_id)
+    orm, core = LinkRepository(db_session), CoreLinkRepository(db_session)
+    links = await orm.bulk_create(
+        [
+            {"full_url": f"https://core.example/{resolve_by_id}/{i}", "short_url": base62_encode_many}
+            for i in range(5)
+        ]
+    )
+    first, second = links[0], links[1]
+    await orm.set_active(second.id, False)
+    db_session.expunge_all()
+
+    assert await core.get(first.id) == await orm.get(first.id)
+    assert await core.get_by_short_url(first.short_url) == await orm.get_by_short_url(first.short_url)
+    assert await core.get_by_full_url(first.full_url) == await orm.get_by_full_url(first.full_url)
+    assert await core.get_by_full_urls([first.full_url, "missing"]) == await orm.get_by_full_urls([first.full_url, "missing"])
+    assert await core.get_all(short_url=first.short_url) == await orm.get_all(short_url=first.short_url)
+    assert await core.get_page(3, first.id, is_active=True) == await orm.get_page(3, first.id, is_active=True)
+    assert await core.get_by_short_url("!!!!!!") is None
+
+    clicked = await core.count_request_by_short_url(first.short_url)
+    assert clicked.count_requests == first.count_requests + 1
+    assert await core.count_request_by_short_url(second.short_url) is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__get_or_create__allocates_only_on_miss(db_session):
+    allocator = SequenceBlockAllocator("links_id_seq", 10)
+    repository = LinkRepository(db_session, id_allocator=allocator)
+    full_url = f"https://allocated.example/{uuid4()}"
+    link, created = await repository.get_or_create(full_url=full_url, short_url=base62_encode_many)
+    assert created and allocator.ids_issued == 1
+
+    assert await repository.get_or_create(full_url=full_url, short_url=base62_encode_many) == (link, False)
+    assert allocator.ids_issued == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__get_recently_clicked(db_session):
+    repository = LinkRepository(db_session)
+    links = await repository.bulk_create(
+        [{"full_url": f"https://hot.example/{i}", "short_url": base62_encode_many} for i in range(3)]
+    )
+    now = universal_time()
+    await repository.add_click_rollups(
+        {(links[0].id, now): 10**9, (links[1].id, now): 10**9 + 2, (links[2].id, now): 10**9 + 1}
+    )
+    await repository.add_click_rollups({(links[0].id, now - timedelta(days=1)): 10**9})
+
+    top = await repository.get_recently_clicked(3, now - timedelta(hours=1))
+    assert [(link.id, clicks) for link, clicks in top] == [
+        (links[1].id, 10**9 + 2),
+        (links[2].id, 10**9 + 1),
+        (links[0].id, 10**9),
+    ]
+    assert await CoreLinkRepository(db_session).get_recently_clicked(3, now - timedelta(hours=1)) == top
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__stats_reconcile__corrects_drift(db_session):
+    repository = LinkRepository(db_session)
+    await repository.bulk_create(
+        [{"full_url": f"https://drift.example/{uuid4()}", "short_url": base62_encode_many} for _ in range(3)]
+    )
+    await db_session.execute(
+        LinkStatsDAO.__table__.update().values(total_links=LinkStatsDAO.total_links + 7, total_clicks=-1)
+    )
+    await db_session.commit()
+
+    stats = LinkStatsRepository(db_session)
+    assert await stats.reconcile()
+    links = LinkDAO.__table__
+    total_links, total_clicks, days = (
+        await db_session.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(links.c.count_requests), 0),
+                func.count(func.distinct(func.date(links.c.created_at))),
+            )
+        )
+    ).one()
+    result = await stats.get(universal_time().date() - timedelta(days=3650))
+    assert (result.total_links, result.total_clicks) == (total_links, total_clicks)
+    assert sum(day.created_links for day in result.created_per_day) == total_links
+    assert len(result.created_per_day) == days
@@ -0,0 +1,25 @@
+import json
+
+from pydantic import TypeAdapter
+
+from app.core.exceptions import render_error
+from app.core.responses import (
+    PydanticJSONResponse,
+    TypedJSONResponse,
+)
+from app.links.exceptions import URLNotFoundError
+from app.links.schemas import LinkDTO
+
+
+def test__json_responses__exclude_hidden_fields():
+    links = [LinkDTO(id=1, full_url="https://example.com", short_url="000001", count_requests=2, is_active=True)]
+    expected = [{"full_url": "https://example.com", "short_url": "000001", "count_requests": 2, "is_active": True}]
+    assert json.loads(TypedJSONResponse(TypeAdapter(list[LinkDTO]), links).body) == expected
+    assert json.loads(PydanticJSONResponse(links).body) == expected
+
+
+def test__application_error__body_is_prerendered():
+    hits = render_error.cache_info().hits
+    assert json.loads(URLNotFoundError().body) == {"msg": URLNotFoundError.message, "code": URLNotFoundError.error_code}
+    assert render_error.cache_info().hits == hits + 1
+    assert json.loads(URLNotFoundError(message="Gone").body)["msg"] == "Gone"
@@ -0,0 +1,178 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import (
+    func,
+    select,
+    text,
+)
+
+from app.core.database.connection import (
+    async_engine,
+    async_session_factory,
+)
+from app.core.database.sequences import configure_interleaved_sequence
+from app.core.database.sharding import ShardSessions
+from app.core.tasks import PartialFlushError
+from app.links import sharding
+from app.links.counters import ClickCounterBuffer
+from app.links.schemas import (
+    LinkDTO,
+    LinkEvent,
+)
+from app.links.service import LinkService
+from app.links.settings import link_settings
+from app.links.utils import (
+    base62_encode,
+    base62_encode_many,
+    url_hash,
+)
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__shard_sessions__opens_lazily_and_closes_owned():
+    primary = FakeSession()
+    async with ShardSessions([FakeSession, FakeSession, FakeSession], primary=primary) as sessions:
+        assert len(sessions) == 3
+        assert sessions[0] is primary
+        shard = sessions[2]
+        assert sessions[2] is shard
+        assert 1 not in sessions._sessions
+    assert shard.closed
+    assert not primary.closed
+
+
+@pytest.fixture
+def two_shards(monkeypatch):
+    monkeypatch.setattr(sharding, "SHARD_COUNT", 2)
+    monkeypatch.setattr(sharding, "shard_id_allocators", [None, None])
+
+
+def test__shard_routing(two_shards):
+    assert sharding.shard_for_id(8) == 0
+    assert sharding.shard_for_id(9) == 1
+    assert sharding.shard_for_short_url(base62_encode(9)) == 1
+    assert sharding.shard_for_short_url("!!!") is None
+    assert sharding.shard_for_full_url("https://example.com/") == int.from_bytes(url_hash("https://example.com/")[:8]) % 2
+
+
+class FakeLinkRepository:
+    def __init__(self, links: list[LinkDTO], fail: bool = False):
+        self.links = links
+        self.fail = fail
+        self.clicks: dict[int, int] = {}
+
+    async def get_page(self, limit: int, after_id: int | None = None, **filters) -> list[LinkDTO]:
+        return [link for link in self.links if after_id is None or link.id > after_id][:limit]
+
+    async def get_recently_clicked(self, limit: int, since: datetime) -> list[tuple[LinkDTO, int]]:
+        items = [(link, link.count_requests) for link in self.links]
+        return sorted(items, key=lambda item: item[1], reverse=True)[:limit]
+
+    async def increment_many_count_requests(self, deltas: dict[int, int]) -> None:
+        if self.fail:
+            raise RuntimeError("shard unavailable")
+        for link_id, delta in deltas.items():
+            self.clicks[link_id] = self.clicks.get(link_id, 0) + delta
+
+
+def fake_link(id_: int, count_requests: int = 0) -> LinkDTO:
+    return LinkDTO(
+        id=id_,
+        full_url=f"https://fake.example/{id_}",
+        short_url=base62_encode(id_),
+        count_requests=count_requests,
+        is_active=True,
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__sharded_link_repository__merges_fan_out(two_shards):
+    repository = sharding.ShardedLinkRepository(ShardSessions([FakeSession, FakeSession]))
+    repository._repositories = {
+        0: FakeLinkRepository([fake_link(2, 5), fake_link(4, 1), fake_link(6, 9)]),
+        1: FakeLinkRepository([fake_link(1, 7), fake_link(3, 0), fake_link(5, 3)]),
+    }
+    assert [link.id for link in await repository.get_page(3)] == [1, 2, 3]
+    assert [link.id for link in await repository.get_page(3, after_id=3)] == [4, 5, 6]
+    assert [link.id for link, _ in await repository.get_recently_clicked(3, datetime.min)] == [6, 1, 2]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__sharded_link_repository__restores_only_failed_shards(two_shards):
+    repository = sharding.ShardedLinkRepository(ShardSessions([FakeSession, FakeSession]))
+    repository._repositories = {0: FakeLinkRepository([]), 1: FakeLinkRepository([], fail=True)}
+    counter = ClickCounterBuffer(flush=repository.increment_many_count_requests, flush_interval=60, flush_threshold=100)
+    for link_id in (1, 2, 2, 3):
+        counter.add(link_id)
+    with pytest.raises(PartialFlushError):
+        await counter.flush()
+    assert (counter.pending(1), counter.pending(2), counter.pending(3)) == (1, 0, 1)
+    assert counter.stats()["flushed_clicks"] == 2
+
+    repository._repositories[1].fail = False
+    await counter.flush()
+    assert repository._repositories[0].clicks == {2: 2}
+    assert repository._repositories[1].clicks == {1: 1, 3: 1}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__sharded_link_repository__commits_notifications_with_other_shards(two_shards, monkeypatch):
+    monkeypatch.setattr(link_settings, "events_enabled", True)
+    async with ShardSessions([async_session_factory, async_session_factory]) as sessions:
+        repository = sharding.ShardedLinkRepository(sessions)
+        links = await repository.shard(1).bulk_create(
+            [
+                {"full_url": f"https://notify.example/{uuid.uuid4()}", "short_url": base62_encode_many}
+                for _ in range(4)
+            ]
+        )
+    link = next(link for link in links if sharding.shard_for_id(link.id) == 1)
+
+    received = asyncio.Queue()
+
+    def on_notification(*args) -> None:
+        received.put_nowait(LinkEvent.model_validate_json(args[-1]))
+
+    async with async_engine.connect() as connection:
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        await driver_connection.add_listener(link_settings.events_channel, on_notification)
+        try:
+            async with ShardSessions([async_session_factory, async_session_factory]) as sessions:
+                await LinkService(repository=sharding.ShardedLinkRepository(sessions)).deactivate_link(link.short_url)
+            event = await asyncio.wait_for(received.get(), timeout=5)
+        finally:
+            await driver_connection.remove_listener(link_settings.events_channel, on_notification)
+    assert event == LinkEvent(action="deactivated", short_url=link.short_url)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__configure_interleaved_sequence__concurrent_workers():
+    async with async_session_factory() as session:
+        await session.execute(text("DROP SEQUENCE IF EXISTS test_interleaved_seq"))
+        await session.execute(text("CREATE SEQUENCE test_interleaved_seq"))
+        await session.execute(select(func.nextval("test_interleaved_seq")).select_from(func.generate_series(1, 5)))
+        await session.commit()
+
+    async def configure_and_allocate() -> list[int]:
+        async with async_session_factory() as session:
+            await configure_interleaved_sequence(session, "test_interleaved_seq", 1, 3)
+            stmt = select(func.nextval("test_interleaved_seq")).select_from(func.generate_series(1, 3))
+            ids = list(await session.scalars(stmt))
+            await session.commit()
+            return ids
+
+    results = await asyncio.gather(*(configure_and_allocate() for _ in range(4)))
+    ids = [id_ for result in results for id_ in result]
+    assert len(set(ids)) == len(ids)
+    assert all(id_ > 5 and id_ % 3 == 1 for id_ in ids)
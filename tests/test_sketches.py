@@ -0,0 +1,102 @@
+import pytest
+
+from app.core.sketches import (
+    BloomFilter,
+    HyperLogLog,
+    SlidingTopK,
+    SpaceSaving,
+)
+
+
+def test__bloom_filter__no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"{i:06d}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    assert len(bloom) == 1000
+
+
+def test__bloom_filter__false_positive_rate():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"known-{i}")
+    false_positives = sum(f"unknown-{i}" in bloom for i in range(10_000))
+    assert false_positives / 10_000 < 0.03
+    assert bloom.estimated_error_rate == pytest.approx(0.01, rel=0.5)
+
+
+def test__bloom_filter__invalid_parameters():
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0, error_rate=0.01)
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=10, error_rate=1)
+
+
+def test__space_saving__finds_heavy_hitters():
+    sketch = SpaceSaving(capacity=10)
+    for i in range(1000):
+        sketch.add("hot" if i % 3 == 0 else f"cold-{i}")
+    sketch.add("warm", 50)
+    [(hot, hot_count, hot_error), (warm, warm_count, _)] = sketch.top(2)
+    assert (hot, warm) == ("hot", "warm")
+    assert hot_count - hot_error <= 334 <= hot_count
+    assert len(sketch) == 10
+    assert sketch.total == 1050
+
+
+def test__space_saving__merged():
+    first, second = SpaceSaving(capacity=5), SpaceSaving(capacity=5)
+    first.add("a", 10)
+    first.add("b", 3)
+    second.add("a", 5)
+    second.add("c", 7)
+    merged = SpaceSaving.merged(5, [(first.items(), first.min_count), (second.items(), second.min_count)])
+    assert merged.top(3) == [("a", 15, 0), ("c", 7, 0), ("b", 3, 0)]
+    assert merged.total == 25
+
+
+def test__sliding_top_k__expires_old_buckets():
+    now = [0.0]
+    window = SlidingTopK(window=60, buckets=6, capacity=10, timer=lambda: now[0])
+    window.add("old", 5)
+    now[0] = 30
+    window.add("new", 2)
+    assert window.summary().top(2) == [("old", 5, 0), ("new", 2, 0)]
+    now[0] = 65
+    assert window.summary().top(2) == [("new", 2, 0)]
+
+
+@pytest.mark.parametrize("precision", [10, 12, 14])
+def test__hyper_log_log__estimate(precision):
+    sketch = HyperLogLog(precision)
+    for i in range(50_000):
+        sketch.add(f"visitor-{i % 20_000}")
+    assert len(sketch) == pytest.approx(20_000, rel=4 * sketch.standard_error)
+    assert len(sketch.to_bytes()) == 1 << precision
+
+
+def test__hyper_log_log__small_cardinality():
+    sketch = HyperLogLog(12)
+    assert len(sketch) == 0
+    for i in range(10):
+        sketch.add(f"visitor-{i}")
+    assert len(sketch) == 10
+
+
+def test__hyper_log_log__merge_and_fold():
+    first, second = HyperLogLog(14), HyperLogLog(12)
+    for i in range(10_000):
+        first.add(f"a-{i}")
+        second.add(f"b-{i}")
+    merged = HyperLogLog.from_bytes(first.to_bytes()).merge(second)
+    assert merged.precision == 12
+    assert len(merged) == pytest.approx(20_000, rel=4 * merged.standard_error)
+    assert first.fold(12).to_bytes() == HyperLogLog(12).merge(first).to_bytes()
+
+
+def test__hyper_log_log__invalid_parameters():
+    with pytest.raises(ValueError):
+        HyperLogLog(3)
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(bytes(1000))
@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+
+from app.core.tasks import PeriodicTask
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test__periodic_task__runs_until_stopped():
+    calls = []
+
+    async def func():
+        calls.append(len(calls))
+        if len(calls) == 2:
+            raise RuntimeError("task failed")
+
+    task = PeriodicTask(func, interval=0.01)
+    task.start()
+    await asyncio.sleep(0.1)
+    await task.stop()
+    assert len(calls) >= 3
+    assert task.failures == 1
+    assert task.runs == len(calls) - 1
+    assert not task.stats()["running"]
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+
+from app.links.utils import (
+    base62_encode,
+    base62_decode,
+    base62_encode_many,
+    base62_decode_many,
+    decode_cursor,
+    encode_cursor,
+    truncate_time,
+    url_hash,
+)
+
+
+@pytest.mark.parametrize("num", [0, 1, 27, 61, 62, 3843, 3844, 56_800_235_583, 56_800_235_584, 2 ** 63 - 1])
+def test__base62__round_trip(num):
+    assert base62_decode(base62_encode(num)) == num
+
+
+def test__base62_decode__known_values():
+    assert base62_decode("00000r") == 27
+    assert base62_decode("000010") == 62
+    assert base62_decode("r") == 27
+
+
+@pytest.mark.parametrize("code", ["", "00000-", "ab cd"])
+def test__base62_decode__invalid_code(code):
+    with pytest.raises(ValueError):
+        base62_decode(code)
+
+
+def test__base62__batch():
+    nums = list(range(10_000)) + [2 ** 40 + 7, 2 ** 63 - 1]
+    codes = base62_encode_many(nums)
+    assert codes == [base62_encode(num) for num in nums]
+    assert base62_decode_many(codes) == nums
+    assert base62_decode_many(["00000r", "bad!"]) == [27, None]
+
+
+def test__url_hash__is_stable():
+    assert url_hash("https://example.com/").hex() == "0f115db062b7c0dd030b16878c99dea5c354b49dc37b38eb8846179c7783e9d7"
+    assert len(url_hash("")) == 32
+    assert url_hash("https://example.com/") != url_hash("http://example.com/")
+
+
+@pytest.mark.parametrize("id_", [0, 1, 42, 2 ** 63 - 1])
+def test__cursor__round_trip(id_):
+    assert decode_cursor(encode_cursor(id_)) == id_
+
+
+@pytest.mark.parametrize("cursor", ["!!", "LTE", "YWJj"])
+def test__decode_cursor__invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize(
+    "granularity, expected",
+    [
+        ("minute", datetime(2026, 10, 18, 13, 47)),
+        ("hour", datetime(2026, 10, 18, 13)),
+        ("day", datetime(2026, 10, 18)),
+    ],
+)
+def test__truncate_time(granularity, expected):
+    assert truncate_time(datetime(2026, 10, 18, 13, 47, 21, 500), granularity) == expected